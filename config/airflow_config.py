@@ -2,37 +2,54 @@
 Airflow configuration settings for financial statement processing pipeline.
 """
 import os
+from datetime import datetime, timedelta
 from pathlib import Path
+from types import MappingProxyType
+
+# Environment snapshot taken once at import; variables don't change after
+# process start, so re-parsing the DAG never walks os.environ again.
+_ENV = dict(os.environ)
 
 # Project paths
-PROJECT_ROOT = Path(__file__).parent.parent
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 TEMPLATES_DIR = PROJECT_ROOT / "templates"
 LOGS_DIR = PROJECT_ROOT / "logs"
 OUTPUT_DIR = PROJECT_ROOT / "logs"
 
 # Data source configuration
-DATA_SOURCE_TYPE = os.getenv('DATA_SOURCE', 'file_watcher')  # 'kafka' or 'file_watcher'
+DATA_SOURCE_TYPE = _ENV.get('DATA_SOURCE', 'file_watcher')  # 'kafka' or 'file_watcher'
+
+# Statement models that consumed messages are validated into
+VALIDATION_BACKEND = _ENV.get('VALIDATION_BACKEND', 'pydantic')  # 'pydantic' or 'msgspec'
+# Build models from schema-checked messages without re-validating them; only
+# for sources whose producers are known to emit well-formed statements
+VALIDATION_TRUST_SCHEMA = _ENV.get('VALIDATION_TRUST_SCHEMA', 'false').lower() == 'true'
 
 # Kafka configuration
-KAFKA_CONFIG = {
-    'bootstrap_servers': os.getenv('KAFKA_BOOTSTRAP_SERVERS', 'localhost:9092'),
-    'topic': os.getenv('KAFKA_TOPIC', 'financial-statements'),
-    'group_id': os.getenv('KAFKA_GROUP_ID', 'airflow-statement-processor'),
+KAFKA_CONFIG = MappingProxyType({
+    'bootstrap_servers': _ENV.get('KAFKA_BOOTSTRAP_SERVERS', 'localhost:9092'),
+    'topic': _ENV.get('KAFKA_TOPIC', 'financial-statements'),
+    'group_id': _ENV.get('KAFKA_GROUP_ID', 'airflow-statement-processor'),
     'auto_offset_reset': 'latest',
     'enable_auto_commit': True,
     'consumer_timeout_ms': 10000,
-}
+    # Fetch/poll batching: records returned per poll() and broker-side batching
+    'max_poll_records': int(_ENV.get('KAFKA_MAX_POLL_RECORDS', '500')),
+    'fetch_min_bytes': int(_ENV.get('KAFKA_FETCH_MIN_BYTES', '1')),
+    'fetch_max_wait_ms': int(_ENV.get('KAFKA_FETCH_MAX_WAIT_MS', '500')),
+})
 
 # File watcher configuration
-FILE_WATCHER_CONFIG = {
-    'input_dir': os.getenv('INPUT_DIR', PROJECT_ROOT / 'input'),
-    'archive_dir': os.getenv('ARCHIVE_DIR', PROJECT_ROOT / 'archive'),
-    'error_dir': os.getenv('ERROR_DIR', PROJECT_ROOT / 'error'),
-    'file_pattern': os.getenv('FILE_PATTERN', '*.json'),
-    'process_existing': os.getenv('PROCESS_EXISTING', 'true').lower() == 'true',
-    'batch_size': int(os.getenv('FILE_BATCH_SIZE', '50')),
-    'polling_interval': int(os.getenv('FILE_POLLING_INTERVAL', '5')),
-}
+FILE_WATCHER_CONFIG = MappingProxyType({
+    'input_dir': _ENV.get('INPUT_DIR', PROJECT_ROOT / 'input'),
+    'archive_dir': _ENV.get('ARCHIVE_DIR', PROJECT_ROOT / 'archive'),
+    'error_dir': _ENV.get('ERROR_DIR', PROJECT_ROOT / 'error'),
+    'file_pattern': _ENV.get('FILE_PATTERN', '*.json'),
+    'process_existing': _ENV.get('PROCESS_EXISTING', 'true').lower() == 'true',
+    'batch_size': int(_ENV.get('FILE_BATCH_SIZE', '50')),
+    'polling_interval': int(_ENV.get('FILE_POLLING_INTERVAL', '5')),
+    'io_workers': int(_ENV.get('FILE_IO_WORKERS', '4')),
+})
 
 # PDF generation settings
 PDF_CONFIG = {
@@ -47,7 +64,15 @@ PDF_CONFIG = {
         'title': 16,
         'heading': 12,
         'body': 10
-    }
+    },
+    # Keep PDFs by the digest of their rendered HTML under OUTPUT_DIR/.cache,
+    # so re-rendering an identical statement copies the earlier file. Off by
+    # default, as each entry is a second copy of a customer's statement.
+    'render_cache': _ENV.get('PDF_RENDER_CACHE', 'false').lower() == 'true',
+    # Seconds a cached PDF is reused before it is deleted
+    'render_cache_ttl': int(_ENV.get('PDF_RENDER_CACHE_TTL', '86400')),
+    # Most PDFs kept in the render cache; the oldest are deleted first
+    'render_cache_max_entries': int(_ENV.get('PDF_RENDER_CACHE_MAX_ENTRIES', '1000')),
 }
 
 # Template configuration
@@ -55,23 +80,40 @@ TEMPLATE_CONFIG = {
     'default_template': 'monthly',
     'default_version': '1.0',
     'supported_formats': ['monthly', 'quarterly', 'annual'],
-    'template_cache_ttl': 3600  # 1 hour
+    'template_cache_ttl': 3600,  # 1 hour
+    'template_cache_size': int(_ENV.get('TEMPLATE_CACHE_SIZE', '64')),
+    # Compiled template bytecode, kept across processes; unset uses Jinja's
+    # per-user cache directory in the system temp dir
+    'bytecode_cache_dir': _ENV.get('TEMPLATE_BYTECODE_CACHE_DIR'),
 }
 
 # Airflow DAG default arguments
-DEFAULT_DAG_ARGS = {
+DEFAULT_DAG_ARGS = MappingProxyType({
     'owner': 'data-engineering',
     'depends_on_past': False,
     'email_on_failure': True,
     'email_on_retry': False,
     'retries': 2,
     'retry_delay_minutes': 5,
+})
+
+# Task default_args built once at import, ready to hand to the DAG. Kept a
+# plain dict because the DAG deep-copies it, which mappingproxy can't do.
+AIRFLOW_DEFAULT_ARGS = {
+    'owner': DEFAULT_DAG_ARGS['owner'],
+    'depends_on_past': DEFAULT_DAG_ARGS['depends_on_past'],
+    'start_date': datetime(2024, 1, 1),
+    'email_on_failure': DEFAULT_DAG_ARGS['email_on_failure'],
+    'email_on_retry': DEFAULT_DAG_ARGS['email_on_retry'],
+    'retries': DEFAULT_DAG_ARGS['retries'],
+    'retry_delay': timedelta(minutes=DEFAULT_DAG_ARGS['retry_delay_minutes']),
+    'catchup': False,
 }
 
 # Monitoring and alerting
-MONITORING_CONFIG = {
+MONITORING_CONFIG = MappingProxyType({
     'enable_metrics': True,
     'metrics_port': 8080,
-    'log_level': os.getenv('LOG_LEVEL', 'INFO'),
+    'log_level': _ENV.get('LOG_LEVEL', 'INFO'),
     'alert_channels': ['email', 'slack']  # Configure as needed
-}
\ No newline at end of file
+})
\ No newline at end of file
@@ -4,23 +4,34 @@ Environment setup utilities for the financial statement pipeline.
 import os
 import sys
 import logging
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Project root, resolved once for every setup helper
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_PROJECT_ROOT_STR = str(_PROJECT_ROOT)
+
+# Shared log format and the noisy third-party loggers quieted by setup_logging
+_LOG_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_THIRD_PARTY_LOGGERS = tuple(
+    logging.getLogger(name) for name in ('kafka', 'reportlab', 'weasyprint')
+)
+_logging_configured = False
+
 
 def setup_environment():
     """
     Set up the environment for the financial statement processing pipeline.
     """
     # Set Python path
-    project_root = Path(__file__).parent.parent
-    if str(project_root) not in sys.path:
-        sys.path.insert(0, str(project_root))
+    if _PROJECT_ROOT_STR not in sys.path:
+        sys.path.insert(0, _PROJECT_ROOT_STR)
     
     # Set environment variables
-    os.environ.setdefault('PYTHONPATH', str(project_root))
+    os.environ.setdefault('PYTHONPATH', _PROJECT_ROOT_STR)
     
     # Configure logging
     setup_logging()
@@ -32,27 +43,37 @@ def setup_logging(log_level: str = "INFO"):
     """
     Configure logging for the pipeline.
     
+    Only the first call has an effect; later calls from other entry points
+    return before any handler (and its log file) is created.
+    
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+    
     # Create logs directory
-    logs_dir = Path(__file__).parent.parent / "logs"
+    logs_dir = _PROJECT_ROOT / "logs"
     logs_dir.mkdir(exist_ok=True)
     
+    handlers = [
+        logging.FileHandler(logs_dir / 'pipeline.log'),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(_LOG_FORMATTER)
+    
     # Configure root logger
     logging.basicConfig(
         level=getattr(logging, log_level.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(logs_dir / 'pipeline.log'),
-            logging.StreamHandler()
-        ]
+        handlers=handlers
     )
     
     # Set specific loggers
-    logging.getLogger('kafka').setLevel(logging.WARNING)
-    logging.getLogger('reportlab').setLevel(logging.WARNING)
-    logging.getLogger('weasyprint').setLevel(logging.WARNING)
+    for third_party_logger in _THIRD_PARTY_LOGGERS:
+        third_party_logger.setLevel(logging.WARNING)
 
 
 def validate_dependencies():
@@ -71,13 +92,12 @@ def validate_dependencies():
         'jsonschema'
     ]
     
-    missing_packages = []
-    
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
+    # Only locate each package; importing weasyprint/reportlab/kafka here
+    # would load native libraries the calling process may never use
+    missing_packages = [
+        package for package in required_packages
+        if find_spec(package) is None
+    ]
     
     if missing_packages:
         logger.error(f"Missing required packages: {', '.join(missing_packages)}")
@@ -92,8 +112,6 @@ def create_required_directories():
     """
     Create all required directories for the pipeline.
     """
-    project_root = Path(__file__).parent.parent
-    
     required_dirs = [
         'logs',
         'output',
@@ -104,9 +122,16 @@ def create_required_directories():
         'config'
     ]
     
-    for dir_path in required_dirs:
-        full_path = project_root / dir_path
-        full_path.mkdir(parents=True, exist_ok=True)
+    # Leaf directories only: makedirs creates the ancestors (templates/)
+    # along the way, so there is no need to visit them separately
+    full_paths = {_PROJECT_ROOT / dir_path for dir_path in required_dirs}
+    leaf_paths = [
+        path for path in full_paths
+        if not any(path in other.parents for other in full_paths)
+    ]
+    
+    for full_path in sorted(leaf_paths):
+        os.makedirs(full_path, exist_ok=True)
         logger.debug(f"Ensured directory exists: {full_path}")
     
     logger.info("All required directories created")
@@ -119,11 +144,9 @@ def get_environment_info() -> Dict[str, str]:
     Returns:
         Dict with environment information
     """
-    project_root = Path(__file__).parent.parent
-    
     return {
         'python_version': sys.version,
-        'project_root': str(project_root),
+        'project_root': _PROJECT_ROOT_STR,
         'working_directory': os.getcwd(),
         'environment': os.environ.get('ENVIRONMENT', 'development'),
         'kafka_servers': os.environ.get('KAFKA_BOOTSTRAP_SERVERS', 'localhost:9092'),
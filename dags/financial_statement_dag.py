@@ -2,37 +2,39 @@
 Apache Airflow DAG for processing financial statements from Kafka and generating PDF reports.
 """
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import shutil
 import sys
 import os
 
+import orjson
+
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from airflow import DAG
-from airflow.operators.python_operator import PythonOperator
-from airflow.operators.dummy_operator import DummyOperator
-from airflow.operators.bash_operator import BashOperator
-from airflow.sensors.s3_key_sensor import S3KeySensor
-from airflow.hooks.base_hook import BaseHook
+from airflow.decorators import task
+from airflow.operators.empty import EmptyOperator
 from airflow.models import Variable
-from airflow.utils.decorators import apply_defaults
 from airflow.exceptions import AirflowException
 
 # Import our custom modules
 from config.airflow_config import (
-    DEFAULT_DAG_ARGS, 
+    AIRFLOW_DEFAULT_ARGS, 
     KAFKA_CONFIG, 
     FILE_WATCHER_CONFIG,
     DATA_SOURCE_TYPE,
-    MONITORING_CONFIG
+    VALIDATION_BACKEND,
+    VALIDATION_TRUST_SCHEMA,
+    OUTPUT_DIR
 )
-from utils.data_sources.data_source_factory import DataSourceManager, DataSourceType
-from utils.validation.statement_validator import StatementValidator, DataTransformer
-from utils.templates.template_manager import TemplateManager
-from utils.pdf.pdf_generator import PDFGenerator
+
+# Pipeline modules (kafka, jinja2, reportlab, weasyprint) are imported inside
+# the task callables so the scheduler's frequent DAG re-parsing stays cheap.
 
 logger = logging.getLogger(__name__)
 
@@ -41,29 +43,145 @@ DAG_ID = 'financial_statement_processing'
 DESCRIPTION = 'Process financial statements from Kafka and generate PDF reports'
 
 # Default arguments for all tasks
-default_args = {
-    'owner': DEFAULT_DAG_ARGS['owner'],
-    'depends_on_past': DEFAULT_DAG_ARGS['depends_on_past'],
-    'start_date': datetime(2024, 1, 1),
-    'email_on_failure': DEFAULT_DAG_ARGS['email_on_failure'],
-    'email_on_retry': DEFAULT_DAG_ARGS['email_on_retry'],
-    'retries': DEFAULT_DAG_ARGS['retries'],
-    'retry_delay': timedelta(minutes=DEFAULT_DAG_ARGS['retry_delay_minutes']),
-    'catchup': False,
-}
+default_args = AIRFLOW_DEFAULT_ARGS
 
 # Create DAG
 dag = DAG(
     dag_id=DAG_ID,
     default_args=default_args,
     description=DESCRIPTION,
-    schedule_interval=timedelta(hours=1),  # Run every hour
+    schedule=timedelta(hours=1),  # Run every hour
     max_active_runs=1,
     tags=['financial', 'kafka', 'pdf', 'statements'],
 )
 
 
-def consume_messages(**context) -> list:
+@lru_cache(maxsize=32)
+def _get_variable(name: str, default, run_id: str):
+    """
+    Resolve an Airflow Variable once per DAG run.
+    
+    Args:
+        name: Variable key
+        default: Value returned when the Variable is not set
+        run_id: DAG run identifier, part of the cache key so a new run
+            always sees fresh values
+        
+    Returns:
+        Variable value or default
+    """
+    return Variable.get(name, default_var=default)
+
+
+def _handoff_dir(context) -> Path:
+    """Run-scoped directory for payloads shared between tasks."""
+    return OUTPUT_DIR / 'handoff' / str(context.get('run_id') or context['ds_nodash'])
+
+
+def _write_handoff(context, name: str, records: Iterable[Dict]) -> Tuple[str, int]:
+    """
+    Write task records to a run-scoped JSONL file.
+    
+    Statement batches are too large to round-trip through the XCom table on
+    every hop, so only the returned path is pushed to XCom. Records may be
+    a generator; each one is written as soon as it is produced.
+    
+    Args:
+        context: Airflow context
+        name: Payload name, used as the file stem
+        records: Records to write, one JSON document per line
+        
+    Returns:
+        Tuple[str, int]: Path of the written file and number of records
+    """
+    handoff_dir = _handoff_dir(context)
+    handoff_dir.mkdir(parents=True, exist_ok=True)
+    
+    handoff_path = handoff_dir / f"{name}.jsonl"
+    record_count = 0
+    with open(handoff_path, 'wb') as f:
+        for record in records:
+            f.write(orjson.dumps(record, default=str) + b"\n")
+            record_count += 1
+    
+    return str(handoff_path), record_count
+
+
+def _read_handoff(handoff_path) -> List[Dict]:
+    """
+    Read records written by _write_handoff.
+    
+    Args:
+        handoff_path: Path pulled from XCom (may be None)
+        
+    Returns:
+        List[Dict]: Records, or an empty list if there is no payload
+    """
+    if not handoff_path or not Path(handoff_path).exists():
+        return []
+    
+    with open(handoff_path, 'rb') as f:
+        return [_intern_repeated_strings(orjson.loads(line)) for line in f if line.strip()]
+
+
+def _intern_repeated_strings(statement: Dict) -> Dict:
+    """
+    Intern short strings that repeat across every statement in a batch.
+    
+    Template names, versions, currencies and categories take a handful of
+    distinct values, so interning records as they are read back from a
+    handoff file lets every statement share one object per value and makes
+    the equality checks in template selection identity hits.
+    
+    Args:
+        statement: Statement record (modified in place)
+        
+    Returns:
+        Dict: The same statement
+    """
+    if not isinstance(statement, dict):
+        return statement
+    
+    metadata = statement.get('metadata') or {}
+    for key in ('template_name', 'template_version', 'currency'):
+        if isinstance(metadata.get(key), str):
+            metadata[key] = sys.intern(metadata[key])
+    
+    for balance in (statement.get('balances') or {}).values():
+        if isinstance(balance, dict):
+            for key in ('account_type', 'currency'):
+                if isinstance(balance.get(key), str):
+                    balance[key] = sys.intern(balance[key])
+    
+    for transaction in statement.get('transactions') or []:
+        if isinstance(transaction, dict) and isinstance(transaction.get('category'), str):
+            transaction['category'] = sys.intern(transaction['category'])
+    
+    return statement
+
+
+# Worker-scoped helpers. Building these compiles the JSON schema, scans the
+# templates directory and sets up Jinja2/WeasyPrint, so each process does it
+# once and reuses the instances across task executions and DAG runs.
+
+@lru_cache(maxsize=1)
+def _get_validator():
+    """Shared StatementValidator for this worker process."""
+    from utils.validation.statement_validator import StatementValidator
+    
+    return StatementValidator(backend=VALIDATION_BACKEND, trust_schema=VALIDATION_TRUST_SCHEMA)
+
+
+@lru_cache(maxsize=1)
+def _get_template_manager():
+    """Shared TemplateManager for this worker process."""
+    from utils.templates.template_manager import TemplateManager
+    
+    return TemplateManager()
+
+
+@task(multiple_outputs=True)
+def consume_messages(**context) -> Dict:
     """
     Task to consume messages from configured data source (Kafka or File Watcher).
     
@@ -71,59 +189,57 @@ def consume_messages(**context) -> list:
         context: Airflow context
         
     Returns:
-        list: List of consumed messages
+        Dict: Path of the file holding the consumed messages and data source info
     """
+    from utils.data_sources.data_source_factory import DataSourceManager
+    
     data_source_manager = None
     
     try:
         # Get data source type from Airflow Variable or use default
-        data_source_type = Variable.get('data_source_type', default_var=DATA_SOURCE_TYPE)
+        run_id = context.get('run_id')
+        data_source_type = _get_variable('data_source_type', DATA_SOURCE_TYPE, run_id)
         logger.info(f"Starting message consumption using {data_source_type} data source")
         
-        # Initialize data source manager
-        data_source_manager = DataSourceManager()
-        
         # Get configuration based on source type
         if data_source_type.lower() == 'kafka':
-            config = KAFKA_CONFIG.copy()
-            batch_size = int(Variable.get('kafka_batch_size', default_var=50))
+            config = KAFKA_CONFIG
+            batch_size = int(_get_variable('kafka_batch_size', 50, run_id))
         else:  # file_watcher
-            config = FILE_WATCHER_CONFIG.copy()
-            batch_size = int(Variable.get('file_batch_size', default_var=50))
+            config = FILE_WATCHER_CONFIG
+            batch_size = int(_get_variable('file_batch_size', 50, run_id))
         
         # Initialize and connect to data source
-        success = data_source_manager.initialize_source(data_source_type, config, auto_connect=True)
-        if not success:
+        data_source_manager = DataSourceManager()
+        if not data_source_manager.initialize_source(data_source_type, config, auto_connect=True):
             raise AirflowException(f"Failed to initialize {data_source_type} data source")
         
-        # Consume batch of messages
-        messages = data_source_manager.consume_batch(batch_size=batch_size)
+        # Stream the batch straight into the handoff file for the next task
+        raw_messages_path, message_count = _write_handoff(
+            context,
+            'raw_messages',
+            data_source_manager.iter_batch(batch_size=batch_size)
+        )
         
-        logger.info(f"Consumed {len(messages)} messages from {data_source_type}")
+        logger.info(f"Consumed {message_count} messages from {data_source_type}")
         
-        # Push messages and metadata to XCom for next task
-        context['task_instance'].xcom_push(
-            key='raw_messages', 
-            value=messages
-        )
-        context['task_instance'].xcom_push(
-            key='data_source_info',
-            value={
+        # Hand messages to the next task via file, metadata via XCom
+        return {
+            'raw_messages_path': raw_messages_path,
+            'data_source_info': {
                 'type': data_source_type,
                 'batch_size': batch_size,
-                'message_count': len(messages),
+                'message_count': message_count,
                 'status': data_source_manager.get_status()
             }
-        )
-        
-        # Also return for logging
-        return messages
+        }
         
     except Exception as e:
         logger.error(f"Error consuming messages: {str(e)}")
         raise AirflowException(f"Message consumption failed: {str(e)}")
     finally:
-        # Ensure data source is properly closed
+        # Each task runs in its own process, so the connection cannot outlive
+        # the run; closing commits the consumed offsets and leaves the group
         if data_source_manager:
             try:
                 data_source_manager.close()
@@ -131,82 +247,74 @@ def consume_messages(**context) -> list:
                 logger.warning(f"Error closing data source: {str(e)}")
 
 
-def validate_and_transform_data(**context) -> list:
+@task
+def validate_and_transform_data(
+    raw_messages_path: Optional[str],
+    data_source_info: Optional[Dict],
+    **context
+) -> Optional[str]:
     """
     Task to validate and transform consumed data.
     
     Args:
+        raw_messages_path: Path of the consumed messages file
+        data_source_info: Data source metadata from consume_messages
         context: Airflow context
         
     Returns:
-        list: List of validated and transformed statements
+        Optional[str]: Path of the file holding the validated statements
     """
+    from utils.validation.statement_validator import DataTransformer
+    
     try:
         logger.info("Starting data validation and transformation")
         
         # Get messages from previous task
-        raw_messages = context['task_instance'].xcom_pull(
-            task_ids='consume_messages',
-            key='raw_messages'
-        )
-        
-        # Get data source info
-        data_source_info = context['task_instance'].xcom_pull(
-            task_ids='consume_messages',
-            key='data_source_info'
-        )
+        raw_messages = _read_handoff(raw_messages_path)
         
         if not raw_messages:
             data_source_type = data_source_info.get('type', 'unknown') if data_source_info else 'unknown'
             logger.warning(f"No messages received from {data_source_type} data source")
-            return []
+            return None
         
         # Initialize validator and transformer
-        validator = StatementValidator()
+        validator = _get_validator()
         transformer = DataTransformer()
         
         validated_statements = []
         
-        for i, message in enumerate(raw_messages):
-            try:
-                # Validate message
-                validated_data = validator.validate_statement_message(message)
-                
-                if validated_data:
-                    # Transform and enrich data
-                    transformed_data = transformer.normalize_amounts(validated_data)
-                    enriched_data = transformer.enrich_statement_data(transformed_data)
-                    
-                    validated_statements.append(enriched_data)
-                    logger.debug(f"Processed message {i+1}: {enriched_data['statement_id']}")
-                else:
-                    logger.warning(f"Message {i+1} failed validation")
-                    
-            except Exception as e:
-                logger.error(f"Error processing message {i+1}: {str(e)}")
-                continue
+        # One batch call validates every message (raw JSON payloads are
+        # parsed by the validator); failures come back as None
+        for i, validated_data in enumerate(validator.validate_many(raw_messages)):
+            if validated_data:
+                validated_statements.append(validated_data)
+                logger.debug(f"Validated message {i+1}: {validated_data['statement_id']}")
+            else:
+                logger.warning(f"Message {i+1} failed validation")
         
-        logger.info(f"Validated and transformed {len(validated_statements)} statements")
+        # Transform and enrich the whole batch at once; a statement that
+        # fails either step is logged and dropped from the batch
+        validated_statements = transformer.normalize_amounts_batch(validated_statements)
+        validated_statements = transformer.enrich_statements_batch(validated_statements)
         
-        # Push validated data to XCom
-        context['task_instance'].xcom_push(
-            key='validated_statements',
-            value=validated_statements
-        )
+        logger.info(f"Validated and transformed {len(validated_statements)} statements")
         
-        return validated_statements
+        # Hand validated data to the next tasks via file
+        validated_statements_path, _ = _write_handoff(context, 'validated_statements', validated_statements)
+        return validated_statements_path
         
     except Exception as e:
         logger.error(f"Error in data validation: {str(e)}")
         raise AirflowException(f"Data validation failed: {str(e)}")
 
 
-def select_templates(**context) -> dict:
+@task(multiple_outputs=False)
+def select_templates(validated_statements_path: Optional[str]) -> dict:
     """
     Task to select appropriate templates for each statement.
     
     Args:
-        context: Airflow context
+        validated_statements_path: Path of the validated statements file
         
     Returns:
         dict: Template selections for each statement
@@ -215,51 +323,47 @@ def select_templates(**context) -> dict:
         logger.info("Starting template selection")
         
         # Get validated statements from previous task
-        validated_statements = context['task_instance'].xcom_pull(
-            task_ids='validate_and_transform_data',
-            key='validated_statements'
-        )
+        validated_statements = _read_handoff(validated_statements_path)
         
         if not validated_statements:
             logger.warning("No validated statements received")
             return {}
         
-        # Initialize template manager
-        template_manager = TemplateManager()
+        template_manager = _get_template_manager()
         
         template_selections = {}
         
+        # Resolve each distinct (template_name, template_version) pair once;
+        # a batch typically only uses a few of them.
+        templates_by_key = {}
+        
         for statement in validated_statements:
-            try:
-                statement_id = statement['statement_id']
-                metadata = statement.get('metadata', {})
-                
-                # Select template based on metadata
-                template = template_manager.select_template(metadata)
-                
-                if template:
-                    template_selections[statement_id] = {
-                        'template_name': metadata.get('template_name', 'monthly'),
-                        'template_version': metadata.get('template_version', '1.0'),
-                        'selected': True
-                    }
-                    logger.debug(f"Template selected for {statement_id}")
-                else:
-                    logger.error(f"No template found for statement {statement_id}")
-                    template_selections[statement_id] = {'selected': False}
-                    
-            except Exception as e:
-                logger.error(f"Error selecting template for statement: {str(e)}")
-                continue
+            statement_id = statement['statement_id']
+            metadata = statement.get('metadata') or {}
+            key = (
+                metadata.get('template_name', 'monthly'),
+                metadata.get('template_version', '1.0')
+            )
+            
+            if key not in templates_by_key:
+                templates_by_key[key] = template_manager.select_template({
+                    'template_name': key[0],
+                    'template_version': key[1]
+                })
+            
+            if templates_by_key[key]:
+                template_selections[statement_id] = {
+                    'template_name': key[0],
+                    'template_version': key[1],
+                    'selected': True
+                }
+                logger.debug(f"Template selected for {statement_id}")
+            else:
+                logger.error(f"No template found for statement {statement_id}")
+                template_selections[statement_id] = {'selected': False}
         
         logger.info(f"Template selection completed for {len(template_selections)} statements")
         
-        # Push template selections to XCom
-        context['task_instance'].xcom_push(
-            key='template_selections',
-            value=template_selections
-        )
-        
         return template_selections
         
     except Exception as e:
@@ -267,12 +371,14 @@ def select_templates(**context) -> dict:
         raise AirflowException(f"Template selection failed: {str(e)}")
 
 
-def generate_pdf_reports(**context) -> dict:
+@task(multiple_outputs=False)
+def generate_pdf_reports(validated_statements_path: Optional[str], template_selections: Optional[Dict]) -> dict:
     """
     Task to generate PDF reports for all validated statements.
     
     Args:
-        context: Airflow context
+        validated_statements_path: Path of the validated statements file
+        template_selections: Template selections from select_templates
         
     Returns:
         dict: Results of PDF generation
@@ -281,77 +387,59 @@ def generate_pdf_reports(**context) -> dict:
         logger.info("Starting PDF generation")
         
         # Get data from previous tasks
-        validated_statements = context['task_instance'].xcom_pull(
-            task_ids='validate_and_transform_data',
-            key='validated_statements'
-        )
-        
-        template_selections = context['task_instance'].xcom_pull(
-            task_ids='select_templates',
-            key='template_selections'
-        )
+        validated_statements = _read_handoff(validated_statements_path)
         
         if not validated_statements:
             logger.warning("No validated statements received for PDF generation")
             return {}
         
-        # Initialize PDF generator
-        pdf_generator = PDFGenerator()
-        
         # Generate PDFs
         generation_results = {}
         successful_generations = 0
+        renderable_statements = []
         
         for statement in validated_statements:
-            try:
-                statement_id = statement['statement_id']
+            statement_id = statement['statement_id']
+            
+            # Check if template was selected successfully
+            if (template_selections and 
+                statement_id in template_selections and 
+                template_selections[statement_id].get('selected', False)):
+                renderable_statements.append(statement)
+            else:
+                generation_results[statement_id] = {
+                    'success': False,
+                    'error': 'Template selection failed'
+                }
+                logger.error(f"Skipping PDF generation for {statement_id} - no template")
+        
+        if renderable_statements:
+            from utils.pdf.pdf_generator import render_pool, render_statement_result
+            
+            # Rendering is CPU-bound and holds the GIL, so fan out across
+            # processes, a few chunks per worker to keep pickling round trips low
+            max_workers = min(len(renderable_statements), os.cpu_count() or 1)
+            chunksize = max(1, len(renderable_statements) // (max_workers * 4))
+            output_dirs = [str(OUTPUT_DIR)] * len(renderable_statements)
+            
+            with render_pool(max_workers) as executor:
+                results = executor.map(
+                    render_statement_result, output_dirs, renderable_statements, chunksize=chunksize
+                )
                 
-                # Check if template was selected successfully
-                if (template_selections and 
-                    statement_id in template_selections and 
-                    template_selections[statement_id].get('selected', False)):
+                for statement, result in zip(renderable_statements, results):
+                    statement_id = statement['statement_id']
+                    generation_results[statement_id] = result
                     
-                    # Generate PDF
-                    pdf_path = pdf_generator.generate_statement_pdf(statement)
-                    
-                    if pdf_path and pdf_generator.validate_pdf_output(pdf_path):
-                        generation_results[statement_id] = {
-                            'success': True,
-                            'pdf_path': str(pdf_path),
-                            'file_size': pdf_path.stat().st_size
-                        }
+                    if result['success']:
                         successful_generations += 1
                         logger.info(f"Successfully generated PDF for {statement_id}")
                     else:
-                        generation_results[statement_id] = {
-                            'success': False,
-                            'error': 'PDF generation or validation failed'
-                        }
                         logger.error(f"Failed to generate valid PDF for {statement_id}")
-                else:
-                    generation_results[statement_id] = {
-                        'success': False,
-                        'error': 'Template selection failed'
-                    }
-                    logger.error(f"Skipping PDF generation for {statement_id} - no template")
-                    
-            except Exception as e:
-                generation_results[statement_id] = {
-                    'success': False,
-                    'error': str(e)
-                }
-                logger.error(f"Error generating PDF for {statement_id}: {str(e)}")
-                continue
         
         logger.info(f"PDF generation completed: {successful_generations} successful, "
                    f"{len(generation_results) - successful_generations} failed")
         
-        # Push results to XCom
-        context['task_instance'].xcom_push(
-            key='pdf_generation_results',
-            value=generation_results
-        )
-        
         return generation_results
         
     except Exception as e:
@@ -359,11 +447,13 @@ def generate_pdf_reports(**context) -> dict:
         raise AirflowException(f"PDF generation failed: {str(e)}")
 
 
-def publish_results_and_cleanup(**context) -> dict:
+@task(multiple_outputs=False)
+def publish_results_and_cleanup(pdf_results: Optional[Dict], **context) -> dict:
     """
     Task to publish results and perform cleanup.
     
     Args:
+        pdf_results: PDF generation results from generate_pdf_reports
         context: Airflow context
         
     Returns:
@@ -372,26 +462,24 @@ def publish_results_and_cleanup(**context) -> dict:
     try:
         logger.info("Starting result publishing and cleanup")
         
-        # Get results from previous tasks
-        pdf_results = context['task_instance'].xcom_pull(
-            task_ids='generate_pdf_reports',
-            key='pdf_generation_results'
-        )
-        
         if not pdf_results:
             logger.warning("No PDF generation results received")
             return {}
         
-        # Calculate summary statistics
+        # Calculate summary statistics in a single pass over the results
         total_statements = len(pdf_results)
-        successful_pdfs = sum(1 for r in pdf_results.values() if r.get('success', False))
-        failed_pdfs = total_statements - successful_pdfs
+        successful_pdfs = 0
+        total_size = 0
+        generated_pdfs = []
         
-        # Calculate total file size
-        total_size = sum(
-            r.get('file_size', 0) for r in pdf_results.values() 
-            if r.get('success', False)
-        )
+        for result in pdf_results.values():
+            if result.get('success', False):
+                successful_pdfs += 1
+                total_size += result.get('file_size', 0)
+                if 'pdf_path' in result:
+                    generated_pdfs.append(result['pdf_path'])
+        
+        failed_pdfs = total_statements - successful_pdfs
         
         summary = {
             'execution_date': context['execution_date'].isoformat(),
@@ -399,11 +487,7 @@ def publish_results_and_cleanup(**context) -> dict:
             'successful_pdf_generations': successful_pdfs,
             'failed_pdf_generations': failed_pdfs,
             'total_pdf_size_bytes': total_size,
-            'success_rate': (successful_pdfs / total_statements * 100) if total_statements > 0 else 0,
-            'generated_pdfs': [
-                r['pdf_path'] for r in pdf_results.values() 
-                if r.get('success', False) and 'pdf_path' in r
-            ]
+            'generated_pdfs': generated_pdfs
         }
         
         logger.info(f"Pipeline execution summary: {summary}")
@@ -419,35 +503,38 @@ def publish_results_and_cleanup(**context) -> dict:
     except Exception as e:
         logger.error(f"Error in result publishing: {str(e)}")
         raise AirflowException(f"Result publishing failed: {str(e)}")
+    finally:
+        # Intermediate payloads are no longer needed once this task has run,
+        # including when there were no results to summarize
+        shutil.rmtree(_handoff_dir(context), ignore_errors=True)
 
 
-def check_pipeline_health(**context):
+@task
+def check_pipeline_health(summary: Optional[Dict]):
     """
     Task to check overall pipeline health and send alerts if needed.
     
     Args:
-        context: Airflow context
+        summary: Execution summary from publish_results_and_cleanup
     """
     try:
-        # Get execution summary
-        summary = context['task_instance'].xcom_pull(
-            task_ids='publish_results_and_cleanup'
-        )
-        
         if summary:
-            success_rate = summary.get('success_rate', 0)
+            successful = summary.get('successful_pdf_generations', 0)
+            total = summary.get('total_statements_processed', 0)
             
-            # Define health thresholds
-            healthy_threshold = 95.0
-            warning_threshold = 80.0
+            # Define health thresholds (percent); compared as integers via
+            # successful * 100 >= threshold * total, so no division is needed
+            healthy_threshold = 95
+            warning_threshold = 80
+            scaled_successful = successful * 100
             
-            if success_rate >= healthy_threshold:
-                logger.info(f"Pipeline healthy: {success_rate:.1f}% success rate")
-            elif success_rate >= warning_threshold:
-                logger.warning(f"Pipeline degraded: {success_rate:.1f}% success rate")
+            if total and scaled_successful >= healthy_threshold * total:
+                logger.info(f"Pipeline healthy: {successful}/{total} PDFs generated")
+            elif total and scaled_successful >= warning_threshold * total:
+                logger.warning(f"Pipeline degraded: {successful}/{total} PDFs generated")
                 # TODO: Send warning alerts
             else:
-                logger.error(f"Pipeline unhealthy: {success_rate:.1f}% success rate")
+                logger.error(f"Pipeline unhealthy: {successful}/{total} PDFs generated")
                 # TODO: Send critical alerts
                 
         else:
@@ -458,51 +545,19 @@ def check_pipeline_health(**context):
 
 
 # Define task dependencies
-start_task = DummyOperator(
-    task_id='start_pipeline',
-    dag=dag
-)
-
-consume_task = PythonOperator(
-    task_id='consume_messages',
-    python_callable=consume_messages,
-    dag=dag
-)
-
-validate_task = PythonOperator(
-    task_id='validate_and_transform_data',
-    python_callable=validate_and_transform_data,
-    dag=dag
-)
-
-template_task = PythonOperator(
-    task_id='select_templates',
-    python_callable=select_templates,
-    dag=dag
-)
-
-pdf_task = PythonOperator(
-    task_id='generate_pdf_reports',
-    python_callable=generate_pdf_reports,
-    dag=dag
-)
-
-publish_task = PythonOperator(
-    task_id='publish_results_and_cleanup',
-    python_callable=publish_results_and_cleanup,
-    dag=dag
-)
-
-health_check_task = PythonOperator(
-    task_id='check_pipeline_health',
-    python_callable=check_pipeline_health,
-    dag=dag
-)
-
-end_task = DummyOperator(
-    task_id='end_pipeline',
-    dag=dag
-)
-
-# Set task dependencies
-start_task >> consume_task >> validate_task >> template_task >> pdf_task >> publish_task >> health_check_task >> end_task
\ No newline at end of file
+with dag:
+    start_task = EmptyOperator(task_id='start_pipeline')
+    end_task = EmptyOperator(task_id='end_pipeline')
+    
+    consumed = consume_messages()
+    validated_statements_path = validate_and_transform_data(
+        consumed['raw_messages_path'],
+        consumed['data_source_info']
+    )
+    template_selections = select_templates(validated_statements_path)
+    pdf_results = generate_pdf_reports(validated_statements_path, template_selections)
+    summary = publish_results_and_cleanup(pdf_results)
+    health_check = check_pipeline_health(summary)
+    
+    start_task >> consumed
+    health_check >> end_task
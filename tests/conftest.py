@@ -1,95 +1,94 @@
 """
 Pytest configuration and shared fixtures for the financial statement pipeline tests.
 """
+import importlib.util
 import pytest
-import json
-import tempfile
+import orjson
 from datetime import datetime, timedelta
 from pathlib import Path
-from unittest.mock import Mock, MagicMock
-import sys
-
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.validation.statement_validator import StatementValidator, DataTransformer
 from utils.templates.template_manager import TemplateManager
 from utils.pdf.pdf_generator import PDFGenerator
-from utils.kafka.consumer import FinancialStatementConsumer
 from utils.monitoring.pipeline_monitor import PipelineMonitor
+from utils.file_watcher import FileWatcherConfig, FinancialStatementFileWatcher
 
 
-@pytest.fixture
-def sample_statement_data():
-    """Sample valid financial statement data for testing."""
-    return {
-        "statement_id": "STMT-2024-001",
+# Serialized once; fixtures parse a fresh copy so tests can mutate it freely
+SAMPLE_STATEMENT_JSON = orjson.dumps({
+    "statement_id": "STMT-2024-001",
+    "customer_id": "CUST-12345",
+    "statement_date": "2024-01-31T23:59:59Z",
+    "statement_type": "monthly",
+    "customer_info": {
         "customer_id": "CUST-12345",
-        "statement_date": "2024-01-31T23:59:59Z",
-        "statement_type": "monthly",
-        "customer_info": {
-            "customer_id": "CUST-12345",
-            "name": "John Doe",
-            "address": {
-                "street": "123 Main St",
-                "city": "Anytown", 
-                "state": "CA",
-                "zip": "12345"
-            },
-            "email": "john.doe@email.com",
-            "phone": "+1-555-123-4567"
+        "name": "John Doe",
+        "address": {
+            "street": "123 Main St",
+            "city": "Anytown", 
+            "state": "CA",
+            "zip": "12345"
         },
-        "transactions": [
-            {
-                "transaction_id": "TXN-001",
-                "date": "2024-01-15T10:30:00Z",
-                "description": "Direct Deposit - Salary",
-                "amount": 3500.00,
-                "category": "Income",
-                "reference": "PAY-001"
-            },
-            {
-                "transaction_id": "TXN-002", 
-                "date": "2024-01-20T14:15:00Z",
-                "description": "Grocery Store Purchase",
-                "amount": -125.50,
-                "category": "Food",
-                "reference": "POS-002"
-            },
-            {
-                "transaction_id": "TXN-003",
-                "date": "2024-01-25T09:00:00Z",
-                "description": "Utility Bill Payment",
-                "amount": -89.25,
-                "category": "Utilities",
-                "reference": "BILL-003"
-            }
-        ],
-        "balances": {
-            "checking": {
-                "opening_balance": 1500.00,
-                "closing_balance": 4785.25,
-                "currency": "USD"
-            },
-            "savings": {
-                "opening_balance": 5000.00,
-                "closing_balance": 5000.00,
-                "currency": "USD"
-            }
+        "email": "john.doe@email.com",
+        "phone": "+1-555-123-4567"
+    },
+    "transactions": [
+        {
+            "transaction_id": "TXN-001",
+            "date": "2024-01-15T10:30:00Z",
+            "description": "Direct Deposit - Salary",
+            "amount": 3500.00,
+            "category": "Income",
+            "reference": "PAY-001"
         },
-        "totals": {
-            "total_credits": 3500.00,
-            "total_debits": 214.75,
-            "net_change": 3285.25,
-            "transaction_count": 3
+        {
+            "transaction_id": "TXN-002", 
+            "date": "2024-01-20T14:15:00Z",
+            "description": "Grocery Store Purchase",
+            "amount": -125.50,
+            "category": "Food",
+            "reference": "POS-002"
         },
-        "metadata": {
-            "template_name": "monthly",
-            "template_version": "1.0",
-            "currency": "USD",
-            "processing_timestamp": "2024-01-31T23:59:59Z"
+        {
+            "transaction_id": "TXN-003",
+            "date": "2024-01-25T09:00:00Z",
+            "description": "Utility Bill Payment",
+            "amount": -89.25,
+            "category": "Utilities",
+            "reference": "BILL-003"
         }
+    ],
+    "balances": {
+        "checking": {
+            "opening_balance": 1500.00,
+            "closing_balance": 4785.25,
+            "currency": "USD"
+        },
+        "savings": {
+            "opening_balance": 5000.00,
+            "closing_balance": 5000.00,
+            "currency": "USD"
+        }
+    },
+    "totals": {
+        "total_credits": 3500.00,
+        "total_debits": 214.75,
+        "net_change": 3285.25,
+        "transaction_count": 3
+    },
+    "metadata": {
+        "template_name": "monthly",
+        "template_version": "1.0",
+        "currency": "USD",
+        "processing_timestamp": "2024-01-31T23:59:59Z"
     }
+})
+
+
+@pytest.fixture
+def sample_statement_data():
+    """Sample valid financial statement data for testing."""
+    return orjson.loads(SAMPLE_STATEMENT_JSON)
 
 
 @pytest.fixture
@@ -148,70 +147,96 @@ def sample_kafka_messages():
     ]
 
 
-@pytest.fixture
-def temp_output_dir():
+# Simple test template written into the temporary templates directory
+TEST_TEMPLATE_HTML = """
+<!DOCTYPE html>
+<html>
+<head><title>{{ statement_type | title }} Statement</title></head>
+<body>
+    <h1>{{ customer_info.name }}</h1>
+    <p>Statement ID: {{ statement_id }}</p>
+    <p>Date: {{ statement_date }}</p>
+</body>
+</html>
+"""
+
+
+@pytest.fixture(scope="session")
+def temp_output_dir(tmp_path_factory):
     """Temporary directory for test outputs."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield Path(temp_dir)
+    return tmp_path_factory.mktemp("output")
 
 
-@pytest.fixture
-def temp_templates_dir():
+@pytest.fixture(scope="session")
+def temp_templates_dir(tmp_path_factory):
     """Temporary directory for test templates."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        templates_dir = Path(temp_dir)
-        
-        # Create sample template structure
-        monthly_dir = templates_dir / "monthly"
-        monthly_dir.mkdir(parents=True)
-        
-        # Create simple test template
-        template_content = """
-        <!DOCTYPE html>
-        <html>
-        <head><title>{{ statement_type | title }} Statement</title></head>
-        <body>
-            <h1>{{ customer_info.name }}</h1>
-            <p>Statement ID: {{ statement_id }}</p>
-            <p>Date: {{ statement_date }}</p>
-        </body>
-        </html>
-        """
-        
-        (monthly_dir / "template.html").write_text(template_content)
-        
-        yield templates_dir
+    templates_dir = tmp_path_factory.mktemp("templates")
+    
+    # Create sample template structure
+    monthly_dir = templates_dir / "monthly"
+    monthly_dir.mkdir()
+    (monthly_dir / "template.html").write_text(TEST_TEMPLATE_HTML)
+    
+    return templates_dir
+
+
+class StubKafkaConsumer:
+    """
+    Minimal stand-in for FinancialStatementConsumer.
+    
+    Cheaper than Mock(spec=...), which introspects the whole class on every
+    fixture setup; no test asserts on these calls.
+    """
+    
+    def connect(self) -> bool:
+        return True
+    
+    def consume_batch(self, batch_size: int = 10, timeout_ms: int = 5000) -> list:
+        return []
+    
+    def close(self):
+        return None
 
 
 @pytest.fixture
 def mock_kafka_consumer():
-    """Mock Kafka consumer for testing."""
-    mock_consumer = Mock(spec=FinancialStatementConsumer)
-    mock_consumer.connect.return_value = True
-    mock_consumer.consume_batch.return_value = []
-    mock_consumer.close.return_value = None
-    return mock_consumer
+    """Stub Kafka consumer for testing."""
+    return StubKafkaConsumer()
 
 
-@pytest.fixture
+# Stateless helpers are built once per session; building the validator
+# compiles its schema, so doing it per test dominates setup time.
+
+@pytest.fixture(scope="session")
 def statement_validator():
     """StatementValidator instance for testing."""
     return StatementValidator()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session", params=[
+    "pydantic",
+    pytest.param("msgspec", marks=pytest.mark.skipif(
+        importlib.util.find_spec("msgspec") is None, reason="msgspec not installed"
+    )),
+])
+def raw_statement_validator(request):
+    """StatementValidator for each raw payload backend."""
+    return StatementValidator(backend=request.param)
+
+
+@pytest.fixture(scope="session")
 def data_transformer():
     """DataTransformer instance for testing.""" 
     return DataTransformer()
 
 
-@pytest.fixture 
+@pytest.fixture(scope="session")
 def template_manager(temp_templates_dir):
     """TemplateManager instance with temporary templates."""
     return TemplateManager(templates_dir=temp_templates_dir)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def pdf_generator(temp_output_dir):
     """PDFGenerator instance with temporary output directory."""
     return PDFGenerator(output_dir=temp_output_dir)
@@ -223,29 +248,57 @@ def pipeline_monitor():
     return PipelineMonitor()
 
 
+@pytest.fixture
+def file_watcher(tmp_path):
+    """File watcher over temporary directories, closed after the test."""
+    watcher = FinancialStatementFileWatcher(FileWatcherConfig(
+        input_dir=str(tmp_path / "input"),
+        archive_dir=str(tmp_path / "archive"),
+        error_dir=str(tmp_path / "error"),
+        polling_interval=1
+    ))
+    yield watcher
+    watcher.close()
+
+
+class XComRecorder:
+    """
+    Dict-backed stand-in for a TaskInstance's XCom methods.
+    
+    Pushed values are kept in ``store`` keyed by (task_id, key) and every push
+    is appended to ``pushes`` so tests can assert on them directly.
+    """
+    
+    def __init__(self, task_id: str = 'test_task'):
+        self.task_id = task_id
+        self.store = {}
+        self.pushes = []
+    
+    def xcom_push(self, key: str, value, **kwargs):
+        self.store[(self.task_id, key)] = value
+        self.pushes.append({'key': key, 'value': value, **kwargs})
+    
+    def xcom_pull(self, task_ids=None, key: str = 'return_value', **kwargs):
+        return self.store.get((task_ids or self.task_id, key))
+
+
 @pytest.fixture
 def airflow_context():
-    """Mock Airflow context for testing DAG tasks."""
-    context = {
+    """Airflow context for testing DAG tasks."""
+    return {
         'execution_date': datetime(2024, 1, 31),
         'ds': '2024-01-31',
         'ds_nodash': '20240131',
-        'task_instance': Mock()
+        'run_id': 'test_run',
+        'task_instance': XComRecorder()
     }
-    
-    # Configure task instance XCom methods
-    context['task_instance'].xcom_push = Mock()
-    context['task_instance'].xcom_pull = Mock()
-    
-    return context
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(autouse=True, scope="session")
 def setup_test_environment():
-    """Automatically set up test environment for all tests."""
-    # Ensure test directories exist
-    test_data_dir = Path(__file__).parent / "data"
-    test_data_dir.mkdir(exist_ok=True)
+    """Set up the test environment once for the whole test session."""
+    # Test files live under tmp_path_factory, which gives each xdist worker its
+    # own directory, so nothing is created inside the source tree
     
     # Configure logging to reduce noise during tests
     import logging
@@ -258,37 +311,62 @@ def setup_test_environment():
     # Cleanup after tests if needed
 
 
-@pytest.fixture
-def sample_pdf_content():
-    """Sample PDF content for testing."""
-    return b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n"
+# Sample PDF content for testing
+SAMPLE_PDF_BYTES = b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n"
+
+# Base test Kafka message; parsed per call so nested values are never shared
+BASE_KAFKA_MESSAGE_JSON = orjson.dumps({
+    "statement_id": "TEST-001",
+    "customer_id": "CUST-TEST",
+    "statement_date": "2024-01-31T23:59:59Z",
+    "statement_type": "monthly",
+    "customer_info": {
+        "customer_id": "CUST-TEST",
+        "name": "Test Customer"
+    },
+    "transactions": [],
+    "balances": {},
+    "metadata": {"template_name": "monthly"}
+})
 
 
 # Helper functions for tests
 def create_test_kafka_message(**overrides):
     """Create a test Kafka message with optional overrides."""
-    base_message = {
-        "statement_id": "TEST-001",
-        "customer_id": "CUST-TEST",
-        "statement_date": "2024-01-31T23:59:59Z",
-        "statement_type": "monthly",
-        "customer_info": {
-            "customer_id": "CUST-TEST",
-            "name": "Test Customer"
-        },
-        "transactions": [],
-        "balances": {},
-        "metadata": {"template_name": "monthly"}
+    # The parsed base is already a private copy, so merge into it in place
+    # rather than building a second dict with base | overrides
+    message = orjson.loads(BASE_KAFKA_MESSAGE_JSON)
+    message.update(overrides)
+    return message
+
+
+def create_test_transaction(**overrides):
+    """Create a test transaction with optional overrides."""
+    transaction = {
+        "transaction_id": "TXN-001",
+        "date": "2024-01-15T10:30:00Z",
+        "description": "Test Transaction",
+        "amount": 100.0
     }
-    
-    base_message.update(overrides)
-    return base_message
+    transaction.update(overrides)
+    return transaction
+
+
+def create_test_balance(**overrides):
+    """Create a test checking account balance with optional overrides."""
+    balance = {
+        "account_type": "checking",
+        "opening_balance": 1000.0,
+        "closing_balance": 1100.0
+    }
+    balance.update(overrides)
+    return balance
 
 
 def create_test_pdf_file(file_path: Path, content: bytes = None):
     """Create a test PDF file."""
     if content is None:
-        content = b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n"
+        content = SAMPLE_PDF_BYTES
     
     file_path.write_bytes(content)
     return file_path
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Tests for the folder-based file watcher.
+"""
+import errno
+import os
+import sys
+import threading
+import time
+
+import pytest
+import orjson
+from watchdog.events import FileSystemEventHandler
+
+from utils.file_watcher import file_watcher as file_watcher_module
+from utils.file_watcher.observer import create_observer
+from conftest import create_test_kafka_message
+
+
+def _write_settled(path, content: bytes):
+    """Write a file with an mtime old enough to skip the stability wait."""
+    path.write_bytes(content)
+    settled = time.time() - 10
+    os.utime(path, (settled, settled))
+    return path
+
+
+class TestFileWatcher:
+    """Test cases for FinancialStatementFileWatcher."""
+
+    def test_add_file_to_queue_dedups_pending_files(self, file_watcher):
+        """Test a file queued twice before it is consumed is read once."""
+        statement_file = _write_settled(
+            file_watcher.config.input_dir / "statement.json", orjson.dumps(create_test_kafka_message())
+        )
+
+        file_watcher.add_file_to_queue(statement_file)
+        file_watcher.add_file_to_queue(statement_file)
+        assert file_watcher.get_queue_size() == 1
+
+        messages = list(file_watcher.consume_messages())
+
+        assert [message['statement_id'] for message in messages] == ["TEST-001"]
+        assert not file_watcher._queued
+
+    @pytest.mark.skipif(file_watcher_module.fcntl is None, reason="flock probe needs fcntl")
+    def test_is_file_ready_waits_for_exclusive_lock(self, file_watcher):
+        """Test a file is not ready while its writer holds an exclusive flock."""
+        statement_file = file_watcher.config.input_dir / "statement.json"
+        empty_file = file_watcher.config.input_dir / "empty.json"
+        empty_file.touch()
+
+        with open(statement_file, 'wb') as writer:
+            writer.write(b'{}')
+            file_watcher_module.fcntl.flock(writer, file_watcher_module.fcntl.LOCK_EX)
+            assert not file_watcher._is_file_ready(statement_file)
+
+        assert file_watcher._is_file_ready(statement_file)
+        assert not file_watcher._is_file_ready(empty_file)
+
+    def test_archive_falls_back_to_move_across_filesystems(self, file_watcher, monkeypatch):
+        """Test archiving copies the file when a rename crosses filesystems."""
+        statement_file = _write_settled(file_watcher.config.input_dir / "statement.json", b'{}')
+        archive_path = file_watcher.config.archive_dir / "archived.json"
+
+        def cross_device_rename(src, dst):
+            raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+        monkeypatch.setattr(file_watcher_module.os, 'rename', cross_device_rename)
+        file_watcher._archive_file(statement_file, str(archive_path))
+
+        assert not statement_file.exists()
+        assert archive_path.read_bytes() == b'{}'
+
+    def test_malformed_array_file_fails_before_yielding(self, file_watcher):
+        """Test a truncated array file yields no records and goes to the error directory."""
+        pytest.importorskip("ijson")
+        records = orjson.dumps([create_test_kafka_message(), create_test_kafka_message()])
+        _write_settled(file_watcher.config.input_dir / "truncated.json", records[:-20])
+
+        messages = list(file_watcher.consume_messages())
+
+        error_files = sorted(path.name for path in file_watcher.config.error_dir.iterdir())
+        assert messages == []
+        assert len(error_files) == 2
+        assert error_files[0].endswith("_truncated.error.txt")
+        assert error_files[1].endswith("_truncated.json")
+
+
+class _RecordingHandler(FileSystemEventHandler):
+    """Collects the type of every file event the observer dispatches."""
+
+    def __init__(self):
+        self.event_types = []
+        self.closed = threading.Event()
+
+    def on_any_event(self, event):
+        # Directory modified events are synthesized for the parent of any
+        # file event, so only file events say what inotify reported
+        if event.is_directory:
+            return
+        self.event_types.append(event.event_type)
+        if event.event_type == 'closed':
+            self.closed.set()
+
+
+class TestObserver:
+    """Test cases for the event-filtered observer."""
+
+    @pytest.mark.skipif(not sys.platform.startswith('linux'), reason="inotify is Linux only")
+    def test_observer_reports_close_write_only(self, tmp_path):
+        """Test writing a file reports the close and none of the open or modify events."""
+        handler = _RecordingHandler()
+        observer = create_observer()
+        observer.schedule(handler, str(tmp_path), recursive=False)
+        observer.start()
+        try:
+            (tmp_path / "statement.json").write_bytes(b'{}')
+            assert handler.closed.wait(timeout=5)
+        finally:
+            observer.stop()
+            observer.join()
+
+        assert handler.event_types == ['closed']
@@ -0,0 +1,36 @@
+"""
+Tests for the Kafka consumer's record validation.
+"""
+import pytest
+import orjson
+from types import SimpleNamespace
+
+from utils.kafka import consumer as consumer_module
+from utils.kafka.consumer import FinancialStatementConsumer
+from conftest import create_test_kafka_message
+
+
+def _record(value: bytes, offset: int):
+    """Minimal stand-in for a kafka-python ConsumerRecord."""
+    return SimpleNamespace(value=value, partition=0, offset=offset)
+
+
+class TestFinancialStatementConsumer:
+    """Test cases for FinancialStatementConsumer."""
+
+    @pytest.mark.parametrize("backend", ["pydantic", "msgspec"])
+    def test_process_records_uses_configured_backend(self, monkeypatch, backend):
+        """Test raw records are validated with the configured backend."""
+        pytest.importorskip(backend)
+        monkeypatch.setattr(consumer_module, "VALIDATION_BACKEND", backend)
+        consumer = FinancialStatementConsumer()
+        records = [
+            _record(orjson.dumps(create_test_kafka_message()), 0),
+            _record(b'{"statement_id": ', 1),
+            _record(orjson.dumps(create_test_kafka_message(statement_id="TEST-002")), 2),
+        ]
+
+        validated = consumer._process_records(records)
+
+        assert consumer.validator.backend == backend
+        assert [statement['statement_id'] for statement in validated] == ["TEST-001", "TEST-002"]
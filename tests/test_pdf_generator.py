@@ -0,0 +1,97 @@
+"""
+Tests for PDF generation utilities.
+"""
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils.pdf import pdf_generator as pdf_generator_module
+from utils.pdf.pdf_generator import PDFGenerator
+
+
+def _render_threads():
+    """Live threads started by PDFGenerator._iter_pipelined_pdfs."""
+    return [thread for thread in threading.enumerate() if thread.name == 'pdf-render']
+
+
+def _age(path, seconds: float):
+    """Move a file's modification time seconds into the past."""
+    aged = time.time() - seconds
+    os.utime(path, (aged, aged))
+
+
+@pytest.fixture
+def render_cache_config(monkeypatch):
+    """Enable the render cache with a one-minute TTL and room for two entries."""
+    monkeypatch.setattr(pdf_generator_module, "PDF_CONFIG", dict(
+        pdf_generator_module.PDF_CONFIG,
+        render_cache=True,
+        render_cache_ttl=60,
+        render_cache_max_entries=2
+    ))
+
+
+class TestPDFGenerator:
+    """Test cases for PDFGenerator."""
+
+    def test_pipelined_batch_stops_renderer_when_closed_early(self, monkeypatch, tmp_path):
+        """Test closing the batch generator early stops the render thread."""
+        generator = PDFGenerator(output_dir=tmp_path)
+        monkeypatch.setattr(generator, "_render_statement", lambda statement_data: statement_data)
+        monkeypatch.setattr(
+            generator, "_write_statement_pdf", lambda rendered: SimpleNamespace(path=rendered['path'])
+        )
+        statements = [{'path': tmp_path / f"{i}.pdf"} for i in range(10)]
+
+        pdf_paths = generator._iter_pipelined_pdfs(statements)
+        assert next(pdf_paths) == tmp_path / "0.pdf"
+        renderers = _render_threads()
+        pdf_paths.close()
+
+        assert renderers
+        assert not any(thread.is_alive() for thread in renderers)
+
+    def test_render_cache_skips_expired_entries(self, render_cache_config, tmp_path):
+        """Test a cached PDF is reused until it is older than the TTL."""
+        generator = PDFGenerator(output_dir=tmp_path)
+        rendered_pdf = tmp_path / "rendered.pdf"
+        rendered_pdf.write_bytes(b"%PDF-1.4 cached")
+        cache_path = generator._render_cache_path("<html>statement</html>")
+
+        generator._store_cached_pdf(rendered_pdf, cache_path)
+        reused = generator._copy_cached_pdf(cache_path, tmp_path / "reused.pdf")
+        _age(cache_path, 120)
+
+        assert reused.size == len(b"%PDF-1.4 cached")
+        assert (tmp_path / "reused.pdf").read_bytes() == b"%PDF-1.4 cached"
+        assert generator._copy_cached_pdf(cache_path, tmp_path / "expired.pdf") is None
+
+    def test_render_cache_pruned_to_ttl_and_max_entries(self, render_cache_config, tmp_path):
+        """Test pruning drops expired entries, then the oldest past max_entries."""
+        cache_dir = tmp_path / ".cache"
+        cache_dir.mkdir()
+        for name, age in [("expired", 120), ("oldest", 30), ("older", 20), ("newest", 10)]:
+            entry = cache_dir / f"{name}.pdf"
+            entry.write_bytes(b"%PDF-1.4")
+            _age(entry, age)
+
+        PDFGenerator(output_dir=tmp_path)
+
+        assert sorted(path.name for path in cache_dir.iterdir()) == ["newest.pdf", "older.pdf"]
+
+    def test_render_cache_pruned_every_interval_stores(self, render_cache_config, monkeypatch, tmp_path):
+        """Test stores prune the cache every _RENDER_CACHE_PRUNE_INTERVAL entries."""
+        monkeypatch.setattr(pdf_generator_module, "_RENDER_CACHE_PRUNE_INTERVAL", 3)
+        generator = PDFGenerator(output_dir=tmp_path)
+        rendered_pdf = tmp_path / "rendered.pdf"
+        rendered_pdf.write_bytes(b"%PDF-1.4")
+
+        for i in range(3):
+            cache_path = generator._render_cache_path(f"<html>{i}</html>")
+            generator._store_cached_pdf(rendered_pdf, cache_path)
+            _age(cache_path, 30 - i)
+
+        assert len(list((tmp_path / ".cache").iterdir())) == 2
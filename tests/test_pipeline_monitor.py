@@ -0,0 +1,101 @@
+"""
+Tests for pipeline monitoring utilities.
+"""
+import threading
+
+import orjson
+
+from utils.monitoring.pipeline_monitor import AlertLevel, PipelineAlertManager, PipelineMetrics
+
+
+def _record_on_thread(metrics: PipelineMetrics, counter: float, duration: float):
+    """Record one counter increment and one timer sample from a new thread."""
+    def record():
+        metrics.increment_counter('messages_consumed_total', counter)
+        metrics.record_timer('kafka_consumption_duration', duration)
+
+    thread = threading.Thread(target=record)
+    thread.start()
+    thread.join()
+
+
+class TestPipelineMetrics:
+    """Test cases for PipelineMetrics."""
+
+    def test_per_thread_shards_merge_on_read(self):
+        """Test counters and timers recorded on several threads are merged when read."""
+        metrics = PipelineMetrics()
+
+        metrics.increment_counter('messages_consumed_total', 1)
+        metrics.record_timer('kafka_consumption_duration', 2.0)
+        _record_on_thread(metrics, 2, 0.5)
+        _record_on_thread(metrics, 3, 4.0)
+
+        assert len(metrics._shards) == 3
+        assert metrics.get_counter('messages_consumed_total') == 6
+        assert metrics.get_timer_stats('kafka_consumption_duration') == {
+            'count': 3, 'sum': 6.5, 'min': 0.5, 'max': 4.0, 'avg': 6.5 / 3
+        }
+
+    def test_export_includes_metrics_from_other_threads(self):
+        """Test export lists metrics that were only recorded on another thread."""
+        metrics = PipelineMetrics()
+
+        _record_on_thread(metrics, 5, 1.0)
+        exported = metrics.export_metrics()
+
+        assert exported['counters'] == {'messages_consumed_total': 5}
+        assert exported['timer_stats']['kafka_consumption_duration']['count'] == 1
+
+
+class TestPipelineAlertManager:
+    """Test cases for PipelineAlertManager."""
+
+    def test_recent_alerts_window(self):
+        """Test only alerts created inside the window are returned, oldest first."""
+        alerts = PipelineAlertManager()
+        alerts.create_alert(AlertLevel.WARNING, 'kafka_consumer', 'old lag')
+        alerts.create_alert(AlertLevel.ERROR, 'error_tracking', 'recent errors')
+        alerts.create_alert(AlertLevel.WARNING, 'kafka_consumer', 'recent lag')
+        # Age the first alert past a one-hour window
+        alerts._alert_times[0] -= 2 * 3600
+
+        recent = alerts.get_recent_alerts(hours=1)
+
+        assert [alert.message for alert in recent] == ['recent errors', 'recent lag']
+        assert [alert.message for alert in alerts.get_recent_alerts(AlertLevel.WARNING, hours=1)] == [
+            'recent lag'
+        ]
+        assert len(alerts.get_recent_alerts(hours=3)) == 3
+
+    def test_recent_alerts_after_eviction(self):
+        """Test the window stays aligned with its alerts once old ones are evicted."""
+        alerts = PipelineAlertManager(max_alerts=2)
+        for i in range(3):
+            alerts.create_alert(AlertLevel.INFO, 'pipeline', f'alert {i}')
+
+        assert [alert.message for alert in alerts.get_recent_alerts()] == ['alert 1', 'alert 2']
+
+
+class TestPipelineMonitor:
+    """Test cases for PipelineMonitor."""
+
+    def test_export_without_pending_writes_synchronously(self, pipeline_monitor, tmp_path):
+        """Test an export with nothing pending is on disk when the call returns."""
+        output_path = tmp_path / "monitoring.json"
+
+        pipeline_monitor.export_monitoring_data(output_path)
+
+        assert pipeline_monitor._export_thread is None
+        assert 'health_status' in orjson.loads(output_path.read_bytes())
+
+    def test_export_while_writing_is_queued(self, pipeline_monitor, tmp_path):
+        """Test an export overlapping a write is queued and flushed by wait_for_exports."""
+        output_path = tmp_path / "monitoring.json"
+
+        with pipeline_monitor._write_lock:
+            pipeline_monitor.export_monitoring_data(output_path)
+            assert not output_path.exists()
+        pipeline_monitor.wait_for_exports()
+
+        assert output_path.exists()
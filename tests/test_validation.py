@@ -2,7 +2,8 @@
 Tests for data validation and transformation utilities.
 """
 import pytest
-from datetime import datetime
+import orjson
+from datetime import datetime, timedelta, timezone
 from utils.validation.statement_validator import (
     StatementValidator, 
     DataTransformer, 
@@ -12,6 +13,7 @@ from utils.validation.statement_validator import (
     Balance,
     StatementMetadata
 )
+from conftest import create_test_balance, create_test_kafka_message, create_test_transaction
 
 
 class TestStatementValidator:
@@ -26,6 +28,116 @@ class TestStatementValidator:
         assert result['customer_id'] == sample_statement_data['customer_id']
         assert len(result['transactions']) == len(sample_statement_data['transactions'])
     
+    def test_validate_raw_json_message(self, raw_statement_validator):
+        """Test validation of a raw JSON message payload."""
+        message = orjson.dumps(create_test_kafka_message())
+        
+        result = raw_statement_validator.validate_statement_message(message)
+        
+        assert result is not None
+        assert result['statement_id'] == "TEST-001"
+    
+    def test_validate_raw_matches_parsed_message(self, raw_statement_validator):
+        """Test a raw payload needing coercion validates like the parsed message."""
+        message = create_test_kafka_message(
+            balances={"checking": create_test_balance(opening_balance="100.00")}
+        )
+        
+        raw_result = raw_statement_validator.validate_statement_message(orjson.dumps(message))
+        
+        assert raw_result is not None
+        assert raw_result == raw_statement_validator.validate_statement_message(message)
+        assert raw_result['balances']['checking']['opening_balance'] == 100.0
+    
+    def test_validate_string_amount_rejected_raw_and_parsed(self, raw_statement_validator):
+        """Test a string transaction amount is rejected as bytes and as a dict."""
+        message = create_test_kafka_message(transactions=[create_test_transaction(amount="3500")])
+        
+        assert raw_statement_validator.validate_statement_message(orjson.dumps(message)) is None
+        assert raw_statement_validator.validate_statement_message(message) is None
+    
+    def test_validate_raw_returns_model(self, statement_validator):
+        """Test raw payload validation returns the statement model."""
+        message = orjson.dumps(create_test_kafka_message(statement_type="quarterly"))
+        
+        statement = statement_validator.validate_raw(message)
+        
+        assert isinstance(statement, FinancialStatement)
+        assert statement.statement_type == "quarterly"
+    
+    def test_validate_raw_rejects_unknown_statement_type(self, raw_statement_validator):
+        """Test raw payload validation keeps the schema's statement types."""
+        message = orjson.dumps(create_test_kafka_message(statement_type="weekly"))
+        
+        assert raw_statement_validator.validate_raw(message) is None
+    
+    def test_validate_invalid_json_message(self, raw_statement_validator):
+        """Test validation of a malformed JSON message payload."""
+        result = raw_statement_validator.validate_statement_message(b'{"statement_id": ')
+        
+        assert result is None
+
+    def test_validate_parsed_message_each_backend(self, raw_statement_validator):
+        """Test parsed messages validate the same way with each backend."""
+        message = create_test_kafka_message(
+            transactions=[create_test_transaction(amount=100)],
+            balances={"checking": create_test_balance()}
+        )
+
+        result = raw_statement_validator.validate_statement_message(message)
+
+        assert result is not None
+        assert result['transactions'][0]['amount'] == 100
+        assert result['balances']['checking']['currency'] == "USD"
+        assert raw_statement_validator.validate_statement_message(
+            dict(message, statement_type="weekly")
+        ) is None
+
+    def test_validate_many(self, statement_validator, invalid_statement_data):
+        """Test batch validation returns a result per message, in order."""
+        valid = create_test_kafka_message()
+        messages = [valid, {"statement_id": "STMT-002"}, invalid_statement_data, orjson.dumps(valid)]
+
+        results = statement_validator.validate_many(messages)
+
+        assert len(results) == 4
+        assert results[0] == statement_validator.validate_statement_message(valid)
+        assert results[1] is None
+        assert results[2] is None
+        assert results[3]['statement_id'] == "TEST-001"
+
+    def test_validate_trusted_schema(self, statement_validator):
+        """Test the trusted path builds the same statement as full validation."""
+        trusted_validator = StatementValidator(trust_schema=True)
+        data = create_test_kafka_message(
+            transactions=[create_test_transaction(amount=100.5)],
+            balances={"checking": create_test_balance()}
+        )
+        
+        result = trusted_validator.validate_statement_message(data)
+        
+        assert result == statement_validator.validate_statement_message(data)
+
+    def test_validate_trusted_schema_checks_balances(self):
+        """Test the trusted path still validates the untyped balance entries."""
+        trusted_validator = StatementValidator(trust_schema=True)
+
+        def with_opening_balance(value):
+            return create_test_kafka_message(
+                balances={"checking": create_test_balance(opening_balance=value)}
+            )
+
+        assert trusted_validator.validate_statement_message(with_opening_balance("abc")) is None
+        result = trusted_validator.validate_statement_message(with_opening_balance("100.00"))
+        assert result['balances']['checking']['opening_balance'] == 100.0
+
+    def test_validators_share_compiled_schema(self, statement_validator):
+        """Test validators with the same schema reuse one compiled check."""
+        other = StatementValidator()
+
+        assert other._schema_validator is statement_validator._schema_validator
+        assert other._check_schema == statement_validator._check_schema
+
     def test_validate_invalid_statement(self, statement_validator, invalid_statement_data):
         """Test validation of invalid statement data."""
         result = statement_validator.validate_statement_message(invalid_statement_data)
@@ -68,11 +180,11 @@ class TestStatementValidator:
     
     def test_validate_future_statement_date(self, statement_validator):
         """Test validation fails for future statement dates."""
-        future_date = datetime.now().replace(year=datetime.now().year + 1)
+        future_date = datetime.now(timezone.utc) + timedelta(days=365)
         data = {
             "statement_id": "STMT-001", 
             "customer_id": "CUST-001",
-            "statement_date": future_date.isoformat() + "Z",
+            "statement_date": future_date.isoformat(),
             "customer_info": {
                 "customer_id": "CUST-001",
                 "name": "Test Customer"
@@ -110,6 +222,19 @@ class TestStatementValidator:
         result = statement_validator.validate_statement_message(data)
         assert result is None
 
+    def test_validate_large_transaction_amount_warns(self, statement_validator, caplog):
+        """Test large transaction amounts pass validation with a warning."""
+        data = create_test_kafka_message(transactions=[
+            create_test_transaction(transaction_id=f"TXN-00{i}", amount=amount)
+            for i, amount in enumerate([10.0, -2_500_000.0, 99.5])
+        ])
+
+        result = statement_validator.validate_statement_message(data)
+
+        assert result is not None
+        assert "Large transaction amount: -2500000.0" in caplog.text
+        assert caplog.text.count("Large transaction amount") == 1
+
 
 class TestDataTransformer:
     """Test cases for DataTransformer."""
@@ -117,7 +242,7 @@ class TestDataTransformer:
     def test_normalize_amounts(self, data_transformer, sample_statement_data):
         """Test amount normalization."""
         # Add some amounts with extra precision
-        test_data = sample_statement_data.copy()
+        test_data = sample_statement_data  # fresh parse per test, safe to mutate
         test_data['transactions'][0]['amount'] = 3500.123456789
         test_data['balances']['checking']['opening_balance'] = 1500.999
         
@@ -128,7 +253,7 @@ class TestDataTransformer:
     
     def test_normalize_amounts_with_different_precision(self, data_transformer, sample_statement_data):
         """Test amount normalization with different precision."""
-        test_data = sample_statement_data.copy()
+        test_data = sample_statement_data
         test_data['transactions'][0]['amount'] = 3500.123
         
         result = data_transformer.normalize_amounts(test_data, precision=1)
@@ -170,6 +295,16 @@ class TestDataTransformer:
         assert result['totals']['total_debits'] == 0
         assert result['totals']['transaction_count'] == 0
     
+    def test_enrich_statements_batch_shares_timestamp(self, data_transformer, sample_statement_data):
+        """Test batch enrichment stamps every statement with the same time."""
+        statements = [sample_statement_data, {"statement_id": "STMT-002", "transactions": []}]
+        
+        result = data_transformer.enrich_statements_batch(statements)
+        
+        timestamps = {s['metadata']['processed_timestamp'] for s in result}
+        assert len(timestamps) == 1
+        assert result[0]['totals']['transaction_count'] == 3
+    
     def test_normalize_amounts_handles_missing_data(self, data_transformer):
         """Test normalization handles missing transaction/balance data."""
         data = {
@@ -181,6 +316,37 @@ class TestDataTransformer:
         result = data_transformer.normalize_amounts(data)
         assert result['statement_id'] == "STMT-001"
 
+    def test_normalize_amounts_batch(self, data_transformer, sample_statement_data):
+        """Test batch normalization across several statements."""
+        test_data = sample_statement_data
+        test_data['transactions'][0]['amount'] = 3500.123456789
+
+        result = data_transformer.normalize_amounts_batch(
+            [test_data, {"statement_id": "STMT-002"}], precision=2
+        )
+
+        assert len(result) == 2
+        assert result[0]['transactions'][0]['amount'] == 3500.12
+        assert result[1]['statement_id'] == "STMT-002"
+
+
+    def test_normalize_amounts_batch_skips_bad_statement(self, data_transformer, sample_statement_data):
+        """Test one statement failing normalization is dropped, not the batch."""
+        bad = create_test_kafka_message(statement_id="BAD-001", totals={})
+        bad['transactions'] = [{"transaction_id": "TXN-X", "amount": "not-a-number"}]
+
+        result = data_transformer.normalize_amounts_batch([bad, sample_statement_data])
+
+        assert [s['statement_id'] for s in result] == [sample_statement_data['statement_id']]
+
+    def test_enrich_statements_batch_skips_bad_statement(self, data_transformer, sample_statement_data):
+        """Test one statement failing enrichment is dropped, not the batch."""
+        bad = create_test_kafka_message(statement_id="BAD-001", transactions=[{"transaction_id": "TXN-X"}])
+
+        result = data_transformer.enrich_statements_batch([bad, sample_statement_data])
+
+        assert [s['statement_id'] for s in result] == [sample_statement_data['statement_id']]
+
 
 class TestPydanticModels:
     """Test cases for Pydantic data models."""
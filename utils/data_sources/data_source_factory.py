@@ -2,13 +2,12 @@
 Data source factory for switching between Kafka and file watcher data sources.
 """
 import logging
-from typing import Dict, List, Optional, Union, Protocol
+from typing import Dict, Iterator, List, Optional, Union, Protocol
 from enum import Enum
 from abc import ABC, abstractmethod
 
-from utils.kafka.consumer import FinancialStatementConsumer as KafkaConsumer
-from utils.file_watcher.file_watcher import FinancialStatementFileWatcher, FileWatcherConfig
-from config.airflow_config import KAFKA_CONFIG
+# The Kafka and file watcher modules (kafka-python, watchdog) are imported by
+# the data source that needs them, so only the configured one is ever loaded.
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +37,8 @@ class DataSourceInterface(Protocol):
 class BaseDataSource(ABC):
     """Base class for data sources with common functionality."""
     
+    __slots__ = ('config', 'is_connected')
+    
     def __init__(self, config: Dict):
         self.config = config
         self.is_connected = False
@@ -57,6 +58,10 @@ class BaseDataSource(ABC):
         """Close the data source connection.""" 
         pass
     
+    def iter_batch(self, batch_size: int = 10, timeout_ms: int = 5000) -> Iterator[Dict]:
+        """Iterate over a batch of messages as they are consumed."""
+        return iter(self.consume_batch(batch_size, timeout_ms))
+    
     def get_status(self) -> Dict:
         """Get data source status."""
         return {
@@ -68,9 +73,13 @@ class BaseDataSource(ABC):
 class KafkaDataSource(BaseDataSource):
     """Kafka data source wrapper."""
     
+    __slots__ = ('consumer',)
+    
     def __init__(self, config: Dict):
         super().__init__(config)
-        self.consumer = KafkaConsumer(config)
+        from utils.kafka.consumer import FinancialStatementConsumer
+        
+        self.consumer = FinancialStatementConsumer(config)
         logger.info("Initialized Kafka data source")
     
     def connect(self) -> bool:
@@ -80,7 +89,7 @@ class KafkaDataSource(BaseDataSource):
             self.is_connected = result
             return result
         except Exception as e:
-            logger.error(f"Failed to connect to Kafka: {str(e)}")
+            logger.error("Failed to connect to Kafka: %s", e)
             return False
     
     def consume_batch(self, batch_size: int = 10, timeout_ms: int = 5000) -> List[Dict]:
@@ -88,16 +97,20 @@ class KafkaDataSource(BaseDataSource):
         try:
             return self.consumer.consume_batch(batch_size, timeout_ms)
         except Exception as e:
-            logger.error(f"Error consuming from Kafka: {str(e)}")
+            logger.error("Error consuming from Kafka: %s", e)
             raise
     
+    def iter_batch(self, batch_size: int = 10, timeout_ms: int = 5000) -> Iterator[Dict]:
+        """Stream a batch from Kafka."""
+        return self.consumer.iter_batch(batch_size, timeout_ms)
+    
     def close(self):
         """Close Kafka connection."""
         try:
             self.consumer.close()
             self.is_connected = False
         except Exception as e:
-            logger.error(f"Error closing Kafka connection: {str(e)}")
+            logger.error("Error closing Kafka connection: %s", e)
     
     def get_status(self) -> Dict:
         """Get Kafka-specific status."""
@@ -114,8 +127,11 @@ class KafkaDataSource(BaseDataSource):
 class FileWatcherDataSource(BaseDataSource):
     """File watcher data source wrapper."""
     
+    __slots__ = ('watcher',)
+    
     def __init__(self, config: Dict):
         super().__init__(config)
+        from utils.file_watcher.file_watcher import FinancialStatementFileWatcher, FileWatcherConfig
         
         # Create FileWatcherConfig from dict
         file_config = FileWatcherConfig(
@@ -125,11 +141,12 @@ class FileWatcherDataSource(BaseDataSource):
             file_pattern=config.get('file_pattern', '*.json'),
             process_existing=config.get('process_existing', True),
             batch_size=config.get('batch_size', 50),
-            polling_interval=config.get('polling_interval', 5)
+            polling_interval=config.get('polling_interval', 5),
+            io_workers=config.get('io_workers', 4)
         )
         
         self.watcher = FinancialStatementFileWatcher(file_config)
-        logger.info(f"Initialized file watcher data source for directory: {config.get('input_dir', 'input')}")
+        logger.info("Initialized file watcher data source for directory: %s", config.get('input_dir', 'input'))
     
     def connect(self) -> bool:
         """Start file watcher."""
@@ -138,7 +155,7 @@ class FileWatcherDataSource(BaseDataSource):
             self.is_connected = result
             return result
         except Exception as e:
-            logger.error(f"Failed to start file watcher: {str(e)}")
+            logger.error("Failed to start file watcher: %s", e)
             return False
     
     def consume_batch(self, batch_size: int = 10, timeout_ms: int = 5000) -> List[Dict]:
@@ -146,16 +163,20 @@ class FileWatcherDataSource(BaseDataSource):
         try:
             return self.watcher.consume_batch(batch_size, timeout_ms)
         except Exception as e:
-            logger.error(f"Error consuming from file watcher: {str(e)}")
+            logger.error("Error consuming from file watcher: %s", e)
             raise
     
+    def iter_batch(self, batch_size: int = 10, timeout_ms: int = 5000) -> Iterator[Dict]:
+        """Stream a batch from files."""
+        return self.watcher.iter_batch(batch_size, timeout_ms)
+    
     def close(self):
         """Stop file watcher."""
         try:
             self.watcher.close()
             self.is_connected = False
         except Exception as e:
-            logger.error(f"Error closing file watcher: {str(e)}")
+            logger.error("Error closing file watcher: %s", e)
     
     def get_status(self) -> Dict:
         """Get file watcher specific status."""
@@ -181,6 +202,11 @@ class DataSourceFactory:
             DataSourceType.KAFKA: KafkaDataSource,
             DataSourceType.FILE_WATCHER: FileWatcherDataSource
         }
+        # String names dispatch straight to (type, class), skipping Enum lookup
+        self._by_name = {
+            source_type.value: (source_type, source_class)
+            for source_type, source_class in self._registered_sources.items()
+        }
         logger.info("Data source factory initialized")
     
     def create_data_source(
@@ -199,31 +225,35 @@ class DataSourceFactory:
             BaseDataSource: Configured data source instance
         """
         try:
-            # Convert string to enum if needed
             if isinstance(source_type, str):
-                source_type = DataSourceType(source_type.lower())
-            
-            if source_type not in self._registered_sources:
-                raise ValueError(f"Unsupported data source type: {source_type}")
+                entry = self._by_name.get(source_type.lower())
+                if entry is None:
+                    raise ValueError(f"Unsupported data source type: {source_type}")
+                source_type, source_class = entry
+            else:
+                source_class = self._registered_sources.get(source_type)
+                if source_class is None:
+                    raise ValueError(f"Unsupported data source type: {source_type}")
             
             # Get default config based on source type
             if config is None:
                 config = self._get_default_config(source_type)
             
             # Create and return data source
-            source_class = self._registered_sources[source_type]
             data_source = source_class(config)
             
-            logger.info(f"Created {source_type.value} data source")
+            logger.info("Created %s data source", source_type.value)
             return data_source
             
         except Exception as e:
-            logger.error(f"Error creating data source {source_type}: {str(e)}")
+            logger.error("Error creating data source %s: %s", source_type, e)
             raise
     
     def _get_default_config(self, source_type: DataSourceType) -> Dict:
         """Get default configuration for a data source type."""
         if source_type == DataSourceType.KAFKA:
+            from config.airflow_config import KAFKA_CONFIG
+            
             return KAFKA_CONFIG.copy()
         elif source_type == DataSourceType.FILE_WATCHER:
             return {
@@ -233,7 +263,8 @@ class DataSourceFactory:
                 'file_pattern': '*.json',
                 'process_existing': True,
                 'batch_size': 50,
-                'polling_interval': 5
+                'polling_interval': 5,
+                'io_workers': 4
             }
         else:
             return {}
@@ -252,12 +283,12 @@ class DataSourceFactory:
         
         source_type_str = os.environ.get(data_source_env_var, "file_watcher")
         
-        logger.info(f"Creating data source from environment: {source_type_str}")
+        logger.info("Creating data source from environment: %s", source_type_str)
         
         try:
             source_type = DataSourceType(source_type_str.lower())
         except ValueError:
-            logger.warning(f"Invalid data source type '{source_type_str}', defaulting to file_watcher")
+            logger.warning("Invalid data source type '%s', defaulting to file_watcher", source_type_str)
             source_type = DataSourceType.FILE_WATCHER
         
         return self.create_data_source(source_type)
@@ -278,7 +309,8 @@ class DataSourceFactory:
             raise ValueError("Source class must inherit from BaseDataSource")
         
         self._registered_sources[source_type] = source_class
-        logger.info(f"Registered new data source type: {source_type.value}")
+        self._by_name[source_type.value] = (source_type, source_class)
+        logger.info("Registered new data source type: %s", source_type.value)
 
 
 class DataSourceManager:
@@ -286,10 +318,15 @@ class DataSourceManager:
     Manager for handling data source lifecycle and switching.
     """
     
+    __slots__ = ('factory', 'current_source', 'current_type', '_consume', '_iter_batch')
+    
     def __init__(self):
         self.factory = DataSourceFactory()
         self.current_source: Optional[BaseDataSource] = None
         self.current_type: Optional[DataSourceType] = None
+        # Bound methods of current_source, None while no source is set
+        self._consume = None
+        self._iter_batch = None
     
     def initialize_source(
         self, 
@@ -314,7 +351,10 @@ class DataSourceManager:
                 self.current_source.close()
             
             # Create new source
+            self._consume = self._iter_batch = None
             self.current_source = self.factory.create_data_source(source_type, config)
+            self._consume = self.current_source.consume_batch
+            self._iter_batch = self.current_source.iter_batch
             
             if isinstance(source_type, str):
                 source_type = DataSourceType(source_type.lower())
@@ -324,14 +364,14 @@ class DataSourceManager:
             if auto_connect:
                 success = self.current_source.connect()
                 if not success:
-                    logger.error(f"Failed to connect to {source_type.value} data source")
+                    logger.error("Failed to connect to %s data source", source_type.value)
                     return False
             
-            logger.info(f"Successfully initialized {source_type.value} data source")
+            logger.info("Successfully initialized %s data source", source_type.value)
             return True
             
         except Exception as e:
-            logger.error(f"Error initializing data source: {str(e)}")
+            logger.error("Error initializing data source: %s", e)
             return False
     
     def switch_source(
@@ -349,7 +389,7 @@ class DataSourceManager:
         Returns:
             bool: True if switch successful
         """
-        logger.info(f"Switching data source from {self.current_type} to {new_source_type}")
+        logger.info("Switching data source from %s to %s", self.current_type, new_source_type)
         return self.initialize_source(new_source_type, config, auto_connect=True)
     
     def get_current_source(self) -> Optional[BaseDataSource]:
@@ -369,10 +409,17 @@ class DataSourceManager:
     
     def consume_batch(self, batch_size: int = 10, timeout_ms: int = 5000) -> List[Dict]:
         """Consume batch from current data source."""
-        if not self.current_source:
+        if self._consume is None:
+            raise RuntimeError("No data source initialized")
+        
+        return self._consume(batch_size, timeout_ms)
+    
+    def iter_batch(self, batch_size: int = 10, timeout_ms: int = 5000) -> Iterator[Dict]:
+        """Stream a batch from current data source without building a list."""
+        if self._iter_batch is None:
             raise RuntimeError("No data source initialized")
         
-        return self.current_source.consume_batch(batch_size, timeout_ms)
+        return self._iter_batch(batch_size, timeout_ms)
     
     def close(self):
         """Close current data source."""
@@ -380,6 +427,7 @@ class DataSourceManager:
             self.current_source.close()
             self.current_source = None
             self.current_type = None
+            self._consume = self._iter_batch = None
 
 
 # Global data source manager instance
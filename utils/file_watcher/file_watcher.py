@@ -1,19 +1,59 @@
 """
 File watcher module for monitoring folder-based JSON input files.
 """
-import json
 import logging
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Generator
+from typing import Dict, Iterator, List, Optional, Generator
 from datetime import datetime
 import shutil
+import errno
+import fnmatch
 import os
-from watchdog.observers import Observer
+import re
+import queue
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 from watchdog.events import FileSystemEventHandler
 
+from .observer import create_observer
+
+if sys.platform != 'win32':
+    import fcntl
+else:
+    fcntl = None
+
+try:
+    # Incremental parser for array files, installed with the "performance" extra
+    import ijson
+    _JSON_ERRORS = (orjson.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _JSON_ERRORS = (orjson.JSONDecodeError,)
+
 logger = logging.getLogger(__name__)
 
+# Bytes read up front to tell array files from single-object files
+_PROBE_SIZE = 4096
+
+# Seconds get_statistics reuses its directory counts before rescanning
+_STATS_TTL = 1.0
+
+# _load_file results other than parsed JSON
+_FILE_MISSING = object()
+_FILE_STILL_WRITING = object()
+_FILE_STREAM = object()
+
+
+def _count_json_files(directory: str) -> int:
+    """Count the JSON files in a directory without building Path objects."""
+    with os.scandir(directory) as entries:
+        return sum(1 for entry in entries if entry.name.endswith('.json'))
+
 
 class FileWatcherConfig:
     """Configuration for file watcher."""
@@ -26,20 +66,29 @@ class FileWatcherConfig:
         file_pattern: str = "*.json",
         process_existing: bool = True,
         batch_size: int = 50,
-        polling_interval: int = 5
+        polling_interval: int = 5,
+        io_workers: int = 4
     ):
         self.input_dir = Path(input_dir)
         self.archive_dir = Path(archive_dir)
         self.error_dir = Path(error_dir)
         self.file_pattern = file_pattern
+        # Compiled once for matching file names in scans and events
+        self.file_pattern_re = re.compile(fnmatch.translate(file_pattern))
         self.process_existing = process_existing
         self.batch_size = batch_size
         self.polling_interval = polling_interval
+        self.io_workers = io_workers
         
         # Ensure directories exist
         self.input_dir.mkdir(parents=True, exist_ok=True)
         self.archive_dir.mkdir(parents=True, exist_ok=True)
         self.error_dir.mkdir(parents=True, exist_ok=True)
+        
+        # String forms for os-level calls on the per-file paths
+        self.input_dir_str = str(self.input_dir)
+        self.archive_dir_str = str(self.archive_dir)
+        self.error_dir_str = str(self.error_dir)
 
 
 class FinancialStatementFileHandler(FileSystemEventHandler):
@@ -48,19 +97,27 @@ class FinancialStatementFileHandler(FileSystemEventHandler):
     def __init__(self, file_watcher):
         self.file_watcher = file_watcher
         
+    def _matches(self, path: str) -> bool:
+        """Check a path's file name against the configured file pattern."""
+        return self.file_watcher.config.file_pattern_re.match(os.path.basename(path)) is not None
+    
     def on_created(self, event):
-        """Handle file creation events."""
-        if not event.is_directory and event.src_path.endswith('.json'):
-            logger.info(f"New file detected: {event.src_path}")
-            # Add small delay to ensure file is fully written
-            time.sleep(1)
+        """Handle file creation events (files moved in, on the inotify observer)."""
+        if not event.is_directory and self._matches(event.src_path):
+            logger.info("New file detected: %s", event.src_path)
+            # Enqueue right away; consume_messages waits for the write to finish
+            self.file_watcher.add_file_to_queue(Path(event.src_path))
+    
+    def on_closed(self, event):
+        """Handle a file being closed after writing, i.e. fully written."""
+        if not event.is_directory and self._matches(event.src_path):
+            logger.info("New file written: %s", event.src_path)
             self.file_watcher.add_file_to_queue(Path(event.src_path))
     
     def on_moved(self, event):
         """Handle file move events."""
-        if not event.is_directory and event.dest_path.endswith('.json'):
-            logger.info(f"File moved to watch directory: {event.dest_path}")
-            time.sleep(1)
+        if not event.is_directory and self._matches(event.dest_path):
+            logger.info("File moved to watch directory: %s", event.dest_path)
             self.file_watcher.add_file_to_queue(Path(event.dest_path))
 
 
@@ -73,11 +130,20 @@ class FinancialStatementFileWatcher:
     def __init__(self, config: Optional[FileWatcherConfig] = None):
         """Initialize the file watcher."""
         self.config = config or FileWatcherConfig()
-        self.file_queue = []
+        # FIFO of pending files, shared with the observer thread, plus a set
+        # mirroring it for O(1) dedup; only the set needs the lock
+        self.file_queue = queue.SimpleQueue()
+        self._queued = set()
+        self._queue_lock = threading.Lock()
+        # Directory counts for get_statistics, rescanned after _STATS_TTL
+        self._dir_counts = None
+        self._dir_counts_at = 0.0
         self.observer = None
+        # Reads and parses queued files ahead of the consumer; started on connect
+        self._io_pool = None
         self.is_connected = False
         
-        logger.info(f"File watcher initialized for directory: {self.config.input_dir}")
+        logger.info("File watcher initialized for directory: %s", self.config.input_dir)
     
     def connect(self) -> bool:
         """
@@ -91,45 +157,56 @@ class FinancialStatementFileWatcher:
                 logger.warning("File watcher is already connected")
                 return True
             
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=self.config.io_workers,
+                thread_name_prefix='file-watcher-io'
+            )
+            
             # Process existing files if configured
             if self.config.process_existing:
                 self._scan_existing_files()
             
             # Set up file system watcher
             event_handler = FinancialStatementFileHandler(self)
-            self.observer = Observer()
+            self.observer = create_observer()
             self.observer.schedule(
                 event_handler, 
-                str(self.config.input_dir), 
+                self.config.input_dir_str, 
                 recursive=False
             )
             self.observer.start()
             
             self.is_connected = True
-            logger.info(f"File watcher started for directory: {self.config.input_dir}")
+            logger.info("File watcher started for directory: %s", self.config.input_dir)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to start file watcher: {str(e)}")
+            logger.error("Failed to start file watcher: %s", e)
             return False
     
     def _scan_existing_files(self):
         """Scan for existing JSON files in the input directory."""
         try:
-            json_files = list(self.config.input_dir.glob("*.json"))
+            pattern_re = self.config.file_pattern_re
+            with os.scandir(self.config.input_dir_str) as entries:
+                json_files = [
+                    entry for entry in entries
+                    if pattern_re.match(entry.name) and entry.is_file()
+                ]
             
             # Sort by modification time (oldest first)
-            json_files.sort(key=lambda x: x.stat().st_mtime)
+            json_files.sort(key=lambda entry: entry.stat().st_mtime)
             
-            for file_path in json_files:
+            for entry in json_files:
+                file_path = Path(entry.path)
                 if self._is_file_ready(file_path):
                     self.add_file_to_queue(file_path)
             
             if json_files:
-                logger.info(f"Found {len(json_files)} existing JSON files to process")
+                logger.info("Found %s existing JSON files to process", len(json_files))
                 
         except Exception as e:
-            logger.error(f"Error scanning existing files: {str(e)}")
+            logger.error("Error scanning existing files: %s", e)
     
     def _is_file_ready(self, file_path: Path) -> bool:
         """
@@ -142,34 +219,94 @@ class FinancialStatementFileWatcher:
             bool: True if file is ready
         """
         try:
-            # Check if file size is stable (wait a bit and check again)
-            initial_size = file_path.stat().st_size
-            time.sleep(0.5)
-            
-            if not file_path.exists():  # File was moved/deleted
-                return False
+            if fcntl is None:
+                # Check if file size is stable (wait a bit and check again)
+                initial_size = file_path.stat().st_size
+                time.sleep(0.05)
                 
-            final_size = file_path.stat().st_size
+                if not file_path.exists():  # File was moved/deleted
+                    return False
+                    
+                final_size = file_path.stat().st_size
+                
+                # File is ready if size is stable and > 0
+                return initial_size == final_size and final_size > 0
             
-            # File is ready if size is stable and > 0
-            return initial_size == final_size and final_size > 0
+            # A writer holding an exclusive lock makes the shared probe fail;
+            # unlocked writers are still caught by _wait_until_stable on consume
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                return os.fstat(fd).st_size > 0
+            except BlockingIOError:
+                return False
+            finally:
+                os.close(fd)
             
+        except FileNotFoundError:  # File was moved/deleted
+            return False
         except Exception as e:
-            logger.error(f"Error checking file readiness {file_path}: {str(e)}")
+            logger.error("Error checking file readiness %s: %s", file_path, e)
+            return False
+    
+    def _wait_until_stable(self, file_path: Path, max_wait: float = 2.0) -> bool:
+        """
+        Wait briefly for a file that may still be being written.
+        
+        Files untouched for a second are taken as complete straight away;
+        otherwise the size is polled with a backoff starting at 50 ms.
+        
+        Args:
+            file_path: Path to the file
+            max_wait: Maximum time to wait in seconds
+            
+        Returns:
+            bool: True if the file is complete and non-empty
+        """
+        try:
+            stat = file_path.stat()
+            if stat.st_size > 0 and time.time() - stat.st_mtime >= 1.0:
+                return True
+            
+            size = stat.st_size
+            delay = 0.05
+            deadline = time.monotonic() + max_wait
+            while time.monotonic() + delay <= deadline:
+                time.sleep(delay)
+                new_size = file_path.stat().st_size
+                if new_size == size and new_size > 0:
+                    return True
+                size = new_size
+                delay *= 2
+            
+            logger.debug("File still being written: %s", file_path)
+            return False
+            
+        except OSError as e:
+            logger.error("Error checking file readiness %s: %s", file_path, e)
             return False
     
     def add_file_to_queue(self, file_path: Path):
         """Add a file to the processing queue."""
-        if file_path.exists() and file_path not in self.file_queue:
-            self.file_queue.append(file_path)
-            logger.debug(f"Added file to queue: {file_path}")
+        if not file_path.exists():
+            return
+        
+        with self._queue_lock:
+            if file_path in self._queued:
+                return
+            self._queued.add(file_path)
+        
+        self.file_queue.put(file_path)
+        logger.debug("Added file to queue: %s", file_path)
     
-    def consume_messages(self, max_messages: int = 100) -> Generator[Dict, None, None]:
+    def consume_messages(self, max_messages: int = 100, wait_timeout: float = 0) -> Generator[Dict, None, None]:
         """
         Consume messages from JSON files.
         
         Args:
             max_messages: Maximum number of messages to yield
+            wait_timeout: Seconds to block for a file if the queue is empty
             
         Yields:
             Dict: Financial statement message from JSON file
@@ -180,50 +317,142 @@ class FinancialStatementFileWatcher:
         
         message_count = 0
         processed_files = []
+        # Files to put back on the queue: still being written, or loaded
+        # ahead but not reached before max_messages
+        requeue = []
+        # (file_path, future) loading on the I/O pool, in queue order
+        pending = deque()
+        # Only the first pick may block; after that, drain what's queued
+        block = wait_timeout > 0
         
         try:
-            while message_count < max_messages and self.file_queue:
-                file_path = self.file_queue.pop(0)
+            while True:
+                # Keep up to io_workers files loading ahead, but no more files
+                # than messages still wanted, since each file holds at least one
+                while (
+                    len(pending) < self.config.io_workers
+                    and message_count + len(pending) < max_messages
+                ):
+                    try:
+                        if block:
+                            file_path = self.file_queue.get(timeout=wait_timeout)
+                            block = False
+                        else:
+                            file_path = self.file_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    
+                    with self._queue_lock:
+                        self._queued.discard(file_path)
+                    pending.append((file_path, self._io_pool.submit(self._load_file, file_path)))
+                
+                if not pending:
+                    break
+                
+                file_path, future = pending.popleft()
+                
+                if message_count >= max_messages:
+                    future.cancel()
+                    requeue.append(file_path)
+                    continue
                 
                 try:
-                    if not file_path.exists():
-                        logger.warning(f"File no longer exists: {file_path}")
+                    data = future.result()
+                    
+                    if data is _FILE_MISSING:
+                        logger.warning("File no longer exists: %s", file_path)
                         continue
                     
-                    # Read and parse JSON file
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
+                    if data is _FILE_STILL_WRITING:
+                        requeue.append(file_path)
+                        continue
                     
                     # Handle both single objects and arrays
-                    if isinstance(data, list):
-                        for item in data:
-                            if message_count >= max_messages:
-                                break
-                            yield item
-                            message_count += 1
-                    else:
-                        yield data
+                    for item in self._iter_file_messages(file_path, data):
+                        if message_count >= max_messages:
+                            break
+                        yield item
                         message_count += 1
                     
                     processed_files.append(file_path)
-                    logger.debug(f"Successfully processed file: {file_path}")
+                    logger.debug("Successfully processed file: %s", file_path)
                     
-                except json.JSONDecodeError as e:
-                    logger.error(f"Invalid JSON in file {file_path}: {str(e)}")
+                except _JSON_ERRORS as e:
+                    logger.error("Invalid JSON in file %s: %s", file_path, e)
                     self._move_file_to_error(file_path, f"JSON decode error: {str(e)}")
                     continue
                 except Exception as e:
-                    logger.error(f"Error processing file {file_path}: {str(e)}")
+                    logger.error("Error processing file %s: %s", file_path, e)
                     self._move_file_to_error(file_path, f"Processing error: {str(e)}")
                     continue
             
             # Archive successfully processed files
-            for file_path in processed_files:
-                self._archive_file(file_path)
+            self._archive_batch(processed_files)
                 
         except Exception as e:
-            logger.error(f"Error during message consumption: {str(e)}")
+            logger.error("Error during message consumption: %s", e)
             raise
+        finally:
+            # Retried on the next call, also if the consumer stopped early
+            for file_path, future in pending:
+                future.cancel()
+                requeue.append(file_path)
+            for file_path in requeue:
+                self.add_file_to_queue(file_path)
+    
+    def _load_file(self, file_path: Path):
+        """
+        Wait for a queued file to be complete and parse it.
+        
+        Runs on the I/O pool. Top-level arrays are left to be streamed by
+        _iter_file_messages when ijson is installed, after one ijson pass
+        that checks the whole file without building any objects, so a
+        malformed file fails here before any of its records are yielded.
+        Everything else is parsed whole with orjson from a single open.
+        
+        Args:
+            file_path: Path to the JSON file
+            
+        Returns:
+            Parsed JSON, or _FILE_MISSING, _FILE_STILL_WRITING or _FILE_STREAM
+        """
+        if not file_path.exists():
+            return _FILE_MISSING
+        
+        if not self._wait_until_stable(file_path):
+            return _FILE_STILL_WRITING
+        
+        with open(file_path, 'rb') as f:
+            head = f.read(_PROBE_SIZE)
+            
+            if ijson is not None and head.lstrip()[:1] == b'[':
+                f.seek(0)
+                deque(ijson.parse(f), maxlen=0)
+                return _FILE_STREAM
+            
+            return orjson.loads(head + f.read())
+    
+    def _iter_file_messages(self, file_path: Path, data) -> Iterator[Dict]:
+        """
+        Yield the statement messages of a file loaded by _load_file.
+        
+        Array files marked for streaming are parsed incrementally with
+        ijson, so only one record is held in memory at a time.
+        
+        Args:
+            file_path: Path to the JSON file
+            data: Result of _load_file for the file
+            
+        Yields:
+            Dict: Statement message
+        """
+        if data is _FILE_STREAM:
+            with open(file_path, 'rb') as f:
+                yield from ijson.items(f, 'item', use_float=True)
+        elif isinstance(data, list):
+            yield from data
+        else:
+            yield data
     
     def consume_batch(self, batch_size: int = 10, timeout_ms: int = 5000) -> List[Dict]:
         """
@@ -236,47 +465,88 @@ class FinancialStatementFileWatcher:
         Returns:
             List[Dict]: List of statement messages
         """
-        messages = []
+        messages = list(self.iter_batch(batch_size, timeout_ms))
+        
+        logger.info("Consumed batch of %s messages from files", len(messages))
+        return messages
+    
+    def iter_batch(self, batch_size: int = 10, timeout_ms: int = 5000) -> Generator[Dict, None, None]:
+        """
+        Yield up to batch_size messages, waiting up to timeout_ms for new files.
+        
+        Same semantics as consume_batch without materializing the batch, so
+        callers can stream messages straight to their destination.
+        
+        Args:
+            batch_size: Number of messages to consume
+            timeout_ms: Timeout in milliseconds
+            
+        Yields:
+            Dict: Statement message
+        """
+        message_count = 0
         start_time = time.time()
         timeout_seconds = timeout_ms / 1000.0
         
         try:
-            # First, process any files already in queue
+            # First, process any files already in queue. consume_messages stops
+            # at max_messages itself, so it always runs to completion and
+            # archives the files it read.
             for message in self.consume_messages(max_messages=batch_size):
-                messages.append(message)
-                if len(messages) >= batch_size:
-                    break
+                yield message
+                message_count += 1
             
             # If we need more messages and haven't timed out, wait for new files
-            while len(messages) < batch_size and (time.time() - start_time) < timeout_seconds:
-                if not self.file_queue:
-                    time.sleep(self.config.polling_interval)
-                    continue
-                
-                for message in self.consume_messages(max_messages=batch_size - len(messages)):
-                    messages.append(message)
-                    if len(messages) >= batch_size:
-                        break
-            
-            logger.info(f"Consumed batch of {len(messages)} messages from files")
-            return messages
+            while message_count < batch_size and (time.time() - start_time) < timeout_seconds:
+                # Blocks on the queue until a file arrives; polling_interval
+                # caps each wait so the timeout is rechecked regularly
+                remaining = timeout_seconds - (time.time() - start_time)
+                for message in self.consume_messages(
+                    max_messages=batch_size - message_count,
+                    wait_timeout=min(remaining, self.config.polling_interval)
+                ):
+                    yield message
+                    message_count += 1
             
         except Exception as e:
-            logger.error(f"Error consuming batch: {str(e)}")
+            logger.error("Error consuming batch: %s", e)
             raise
     
-    def _archive_file(self, file_path: Path):
+    def _archive_batch(self, file_paths: List[Path]):
+        """
+        Move processed files to the archive directory.
+        
+        The whole batch shares one timestamp prefix. Queued files all come
+        from the input directory, so their names are unique within a batch.
+        
+        Args:
+            file_paths: Processed files to archive
+        """
+        if not file_paths:
+            return
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        archive_dir = self.config.archive_dir_str
+        
+        for file_path in file_paths:
+            self._archive_file(file_path, os.path.join(archive_dir, f"{timestamp}_{file_path.name}"))
+    
+    def _archive_file(self, file_path: Path, archive_path: str):
         """Move processed file to archive directory."""
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            archive_name = f"{timestamp}_{file_path.name}"
-            archive_path = self.config.archive_dir / archive_name
+            try:
+                # A plain rename when the archive is on the same filesystem
+                os.rename(file_path, archive_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(str(file_path), archive_path)
             
-            shutil.move(str(file_path), str(archive_path))
-            logger.debug(f"Archived file: {file_path} -> {archive_path}")
+            self._count_moved_file('archived_files')
+            logger.debug("Archived file: %s -> %s", file_path, archive_path)
             
         except Exception as e:
-            logger.error(f"Error archiving file {file_path}: {str(e)}")
+            logger.error("Error archiving file %s: %s", file_path, e)
             # If archiving fails, try to at least remove the original file
             try:
                 file_path.unlink()
@@ -288,46 +558,68 @@ class FinancialStatementFileWatcher:
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             error_name = f"{timestamp}_{file_path.name}"
-            error_path = self.config.error_dir / error_name
+            error_path = os.path.join(self.config.error_dir_str, error_name)
             
-            shutil.move(str(file_path), str(error_path))
+            shutil.move(str(file_path), error_path)
+            self._count_moved_file('error_files')
             
             # Create error report file
-            error_report_path = error_path.with_suffix('.error.txt')
-            with open(error_report_path, 'w') as f:
-                f.write(f"Error processing file: {file_path.name}\n")
-                f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-                f.write(f"Error: {error_message}\n")
+            error_report_path = os.path.splitext(error_path)[0] + '.error.txt'
+            report = (
+                f"Error processing file: {file_path.name}\n"
+                f"Timestamp: {datetime.now().isoformat()}\n"
+                f"Error: {error_message}\n"
+            ).encode()
+            fd = os.open(error_report_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, report)
+            finally:
+                os.close(fd)
             
-            logger.error(f"Moved problematic file to error directory: {error_path}")
+            logger.error("Moved problematic file to error directory: %s", error_path)
             
         except Exception as e:
-            logger.error(f"Error moving file to error directory {file_path}: {str(e)}")
+            logger.error("Error moving file to error directory %s: %s", file_path, e)
+    
+    def _count_moved_file(self, count_key: str):
+        """Keep the cached directory counts current as files are moved."""
+        counts = self._dir_counts
+        if counts is not None:
+            counts['input_files_pending'] = max(counts['input_files_pending'] - 1, 0)
+            counts[count_key] += 1
     
     def get_queue_size(self) -> int:
         """Get the current size of the file processing queue."""
-        return len(self.file_queue)
+        return self.file_queue.qsize()
     
     def get_statistics(self) -> Dict:
-        """Get file watcher statistics."""
+        """
+        Get file watcher statistics.
+        
+        Directory counts are rescanned at most once per _STATS_TTL seconds;
+        files this watcher moves in between are counted as they go.
+        """
         try:
-            input_files = len(list(self.config.input_dir.glob("*.json")))
-            archived_files = len(list(self.config.archive_dir.glob("*.json")))
-            error_files = len(list(self.config.error_dir.glob("*.json")))
+            now = time.monotonic()
+            if self._dir_counts is None or now - self._dir_counts_at >= _STATS_TTL:
+                self._dir_counts = {
+                    'input_files_pending': _count_json_files(self.config.input_dir_str),
+                    'archived_files': _count_json_files(self.config.archive_dir_str),
+                    'error_files': _count_json_files(self.config.error_dir_str)
+                }
+                self._dir_counts_at = now
             
             return {
                 'is_connected': self.is_connected,
                 'queue_size': self.get_queue_size(),
-                'input_files_pending': input_files,
-                'archived_files': archived_files,
-                'error_files': error_files,
-                'input_directory': str(self.config.input_dir),
-                'archive_directory': str(self.config.archive_dir),
-                'error_directory': str(self.config.error_dir)
+                **self._dir_counts,
+                'input_directory': self.config.input_dir_str,
+                'archive_directory': self.config.archive_dir_str,
+                'error_directory': self.config.error_dir_str
             }
             
         except Exception as e:
-            logger.error(f"Error getting statistics: {str(e)}")
+            logger.error("Error getting statistics: %s", e)
             return {'error': str(e)}
     
     def close(self):
@@ -337,11 +629,21 @@ class FinancialStatementFileWatcher:
                 self.observer.stop()
                 self.observer.join()
             
+            if self._io_pool is not None:
+                self._io_pool.shutdown(wait=True)
+                self._io_pool = None
+            
             self.is_connected = False
             logger.info("File watcher stopped")
             
         except Exception as e:
-            logger.error(f"Error stopping file watcher: {str(e)}")
+            logger.error("Error stopping file watcher: %s", e)
+
+
+# Defaults for keys missing from a message, shared across calls instead of
+# allocating fresh empties; extracted records must treat them as read-only
+_EMPTY_DICT = {}
+_EMPTY_LIST = []
 
 
 class StatementMessageProcessor:
@@ -361,17 +663,20 @@ class StatementMessageProcessor:
         Returns:
             Dict: Extracted metadata
         """
-        metadata = message.get('metadata', {})
+        get = message.get
+        metadata_get = get('metadata', _EMPTY_DICT).get
         
+        # A dict display with constant keys builds in one step, cheaper than
+        # filling a dict key by key or through update(**kwargs)
         return {
-            'statement_id': message.get('statement_id'),
-            'customer_id': message.get('customer_id'),
-            'statement_date': message.get('statement_date'),
-            'statement_type': message.get('statement_type', 'monthly'),
-            'template_name': metadata.get('template_name', 'monthly'),
-            'template_version': metadata.get('template_version', '1.0'),
-            'currency': metadata.get('currency', 'USD'),
-            'processing_timestamp': metadata.get('processing_timestamp'),
+            'statement_id': get('statement_id'),
+            'customer_id': get('customer_id'),
+            'statement_date': get('statement_date'),
+            'statement_type': get('statement_type', 'monthly'),
+            'template_name': metadata_get('template_name', 'monthly'),
+            'template_version': metadata_get('template_version', '1.0'),
+            'currency': metadata_get('currency', 'USD'),
+            'processing_timestamp': metadata_get('processing_timestamp'),
             'source': 'file_watcher'  # Identify source
         }
     
@@ -380,17 +685,21 @@ class StatementMessageProcessor:
         """
         Extract financial data from statement message.
         
+        Sections missing from the message default to shared empty
+        containers, so callers must not mutate them in place.
+        
         Args:
             message: Statement message from JSON file
             
         Returns:
             Dict: Organized financial data
         """
+        get = message.get
         return {
-            'customer_info': message.get('customer_info', {}),
-            'account_summary': message.get('account_summary', {}),
-            'transactions': message.get('transactions', []),
-            'balances': message.get('balances', {}),
-            'line_items': message.get('line_items', []),
-            'totals': message.get('totals', {})
-        }
\ No newline at end of file
+            'customer_info': get('customer_info', _EMPTY_DICT),
+            'account_summary': get('account_summary', _EMPTY_DICT),
+            'transactions': get('transactions', _EMPTY_LIST),
+            'balances': get('balances', _EMPTY_DICT),
+            'line_items': get('line_items', _EMPTY_LIST),
+            'totals': get('totals', _EMPTY_DICT)
+        }
@@ -1,16 +1,23 @@
 """
 Kafka consumer module for financial statement data processing.
 """
-import json
 import logging
-from typing import Dict, List, Optional, Generator
+import threading
+import time
+from typing import Dict, List, Optional, Generator, Union
+import orjson
 from kafka import KafkaConsumer
 from kafka.errors import KafkaError, KafkaTimeoutError
-from config.airflow_config import KAFKA_CONFIG
+from config.airflow_config import KAFKA_CONFIG, VALIDATION_BACKEND, VALIDATION_TRUST_SCHEMA
 from utils.validation.statement_validator import StatementValidator
 
-logger = logging.getLogger(__name__)
+try:
+    # On-demand JSON parser, installed with the "performance" extra
+    import simdjson
+except ImportError:
+    simdjson = None
 
+logger = logging.getLogger(__name__)
 
 class FinancialStatementConsumer:
     """
@@ -21,7 +28,11 @@ class FinancialStatementConsumer:
         """Initialize the Kafka consumer with configuration."""
         self.config = config or KAFKA_CONFIG
         self.consumer = None
-        self.validator = StatementValidator()
+        # Records reach the validator as raw payloads, which the configured
+        # backend decodes directly
+        self.validator = StatementValidator(
+            backend=VALIDATION_BACKEND, trust_schema=VALIDATION_TRUST_SCHEMA
+        )
         
     def connect(self) -> bool:
         """
@@ -30,22 +41,28 @@ class FinancialStatementConsumer:
         Returns:
             bool: True if connection successful, False otherwise
         """
+        settings = {
+            'bootstrap_servers': self.config['bootstrap_servers'],
+            'group_id': self.config['group_id'],
+            'auto_offset_reset': self.config['auto_offset_reset'],
+            'enable_auto_commit': self.config['enable_auto_commit'],
+            'consumer_timeout_ms': self.config['consumer_timeout_ms'],
+            'max_poll_records': self.config.get('max_poll_records', 500),
+            'fetch_min_bytes': self.config.get('fetch_min_bytes', 1),
+            'fetch_max_wait_ms': self.config.get('fetch_max_wait_ms', 500),
+        }
+        
         try:
-            self.consumer = KafkaConsumer(
-                self.config['topic'],
-                bootstrap_servers=self.config['bootstrap_servers'],
-                group_id=self.config['group_id'],
-                auto_offset_reset=self.config['auto_offset_reset'],
-                enable_auto_commit=self.config['enable_auto_commit'],
-                consumer_timeout_ms=self.config['consumer_timeout_ms'],
-                value_deserializer=lambda x: json.loads(x.decode('utf-8'))
-            )
+            # No value_deserializer: records keep their raw bytes, which the
+            # validator decodes straight into the statement model, so
+            # rejected messages are never built into dicts
+            self.consumer = KafkaConsumer(self.config['topic'], **settings)
             
-            logger.info(f"Connected to Kafka cluster at {self.config['bootstrap_servers']}")
+            logger.info("Connected to Kafka cluster at %s", self.config['bootstrap_servers'])
             return True
             
         except KafkaError as e:
-            logger.error(f"Failed to connect to Kafka: {str(e)}")
+            logger.error("Failed to connect to Kafka: %s", e)
             return False
     
     def consume_messages(self, max_messages: int = 100) -> Generator[Dict, None, None]:
@@ -63,40 +80,59 @@ class FinancialStatementConsumer:
                 raise RuntimeError("Failed to establish Kafka connection")
         
         message_count = 0
+        # An empty poll after consumer_timeout_ms ends the batch, as the
+        # iterator protocol did
+        poll_timeout_ms = self.config['consumer_timeout_ms']
         
         try:
-            for message in self.consumer:
-                if message_count >= max_messages:
+            # One poll() returns a whole fetch, and records past max_messages
+            # are never pulled off the consumer and dropped
+            while message_count < max_messages:
+                records = self.consumer.poll(
+                    timeout_ms=poll_timeout_ms,
+                    max_records=max_messages - message_count
+                )
+                if not records:
                     break
-                    
-                try:
-                    # Validate message structure
-                    validated_data = self.validator.validate_statement_message(
-                        message.value
-                    )
-                    
-                    if validated_data:
-                        logger.debug(f"Processing message from partition {message.partition}, "
-                                   f"offset {message.offset}")
+                
+                for partition_messages in records.values():
+                    for validated_data in self._process_records(partition_messages):
                         yield validated_data
                         message_count += 1
-                    else:
-                        logger.warning(f"Invalid message format in partition {message.partition}, "
-                                     f"offset {message.offset}")
-                        
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {str(e)}")
-                    continue
-                except Exception as e:
-                    logger.error(f"Error processing message: {str(e)}")
-                    continue
                     
         except KafkaTimeoutError:
             logger.info("Consumer timeout reached, no new messages available")
         except KafkaError as e:
-            logger.error(f"Kafka error during consumption: {str(e)}")
+            logger.error("Kafka error during consumption: %s", e)
             raise
             
+    def _process_records(self, messages: List) -> List[Dict]:
+        """
+        Validate the records from one poll() in a single batch call.
+        
+        Args:
+            messages: Kafka ConsumerRecords
+            
+        Returns:
+            List[Dict]: Validated statement messages, invalid records dropped
+        """
+        results = self.validator.validate_many([message.value for message in messages])
+        
+        # Checked once per batch rather than per record; the messages are
+        # only formatted when a handler will emit them
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        validated = []
+        for message, validated_data in zip(messages, results):
+            if validated_data:
+                if debug_enabled:
+                    logger.debug("Processing message from partition %s, offset %s",
+                                 message.partition, message.offset)
+                validated.append(validated_data)
+            else:
+                logger.warning("Invalid message format in partition %s, offset %s",
+                               message.partition, message.offset)
+        return validated
+    
     def consume_batch(self, batch_size: int = 10, timeout_ms: int = 5000) -> List[Dict]:
         """
         Consume a batch of messages with timeout.
@@ -108,33 +144,109 @@ class FinancialStatementConsumer:
         Returns:
             List[Dict]: List of validated statement messages
         """
-        messages = []
+        messages = list(self.iter_batch(batch_size, timeout_ms))
+        
+        logger.info("Successfully consumed %d messages", len(messages))
+        return messages
+    
+    def iter_batch(self, batch_size: int = 10, timeout_ms: int = 5000) -> Generator[Dict, None, None]:
+        """
+        Yield up to batch_size validated messages, polling for up to timeout_ms.
+        
+        Same semantics as consume_batch, but messages are handed on as each
+        poll() returns, so at most one poll's worth of records is held in
+        memory at a time.
+        
+        Args:
+            batch_size: Number of messages to consume
+            timeout_ms: Timeout in milliseconds
+            
+        Yields:
+            Dict: Validated statement message
+        """
+        if not self.consumer:
+            if not self.connect():
+                raise RuntimeError("Failed to establish Kafka connection")
+        
+        message_count = 0
+        deadline = time.monotonic() + timeout_ms / 1000.0
         
         try:
-            for message in self.consume_messages(max_messages=batch_size):
-                messages.append(message)
+            # poll() hands back up to max_records messages per call instead of
+            # one per iterator step
+            while message_count < batch_size:
+                remaining_ms = int((deadline - time.monotonic()) * 1000)
+                if remaining_ms <= 0:
+                    break
+                
+                records = self.consumer.poll(
+                    timeout_ms=remaining_ms,
+                    max_records=batch_size - message_count
+                )
+                if not records:
+                    break
                 
-            logger.info(f"Successfully consumed {len(messages)} messages")
-            return messages
+                for partition_messages in records.values():
+                    for validated_data in self._process_records(partition_messages):
+                        yield validated_data
+                        message_count += 1
             
         except Exception as e:
-            logger.error(f"Error consuming batch: {str(e)}")
+            logger.error("Error consuming batch: %s", e)
             raise
     
     def close(self):
         """Close the Kafka consumer connection."""
         if self.consumer:
             self.consumer.close()
+            self.consumer = None
             logger.info("Kafka consumer connection closed")
 
 
+if simdjson is not None:
+    # A simdjson Parser reuses its buffers but is not thread safe, and each
+    # parse invalidates the previous document, so keep one per thread
+    _parser_local = threading.local()
+
+    def _get_parser():
+        parser = getattr(_parser_local, 'parser', None)
+        if parser is None:
+            parser = _parser_local.parser = simdjson.Parser()
+        return parser
+
+    def _materialize(value):
+        if isinstance(value, simdjson.Object):
+            return value.as_dict()
+        if isinstance(value, simdjson.Array):
+            return value.as_list()
+        return value
+
+
+def _parse_message(message: Union[Dict, bytes, str]):
+    """
+    Return a mapping view of a statement message.
+    
+    Raw payloads are parsed with simdjson when it is installed, which only
+    builds Python objects for the keys the extractors read. Values looked up
+    in the returned view must go through ``_materialize`` before they outlive
+    the next parse on this thread.
+    """
+    if isinstance(message, dict):
+        return message
+    if simdjson is not None:
+        return _get_parser().parse(message)
+    return orjson.loads(message)
+
+
 class StatementMessageProcessor:
     """
     Processor for handling individual financial statement messages.
+    
+    Messages may be given as parsed dicts or as raw JSON payloads.
     """
     
     @staticmethod
-    def extract_metadata(message: Dict) -> Dict:
+    def extract_metadata(message: Union[Dict, bytes, str]) -> Dict:
         """
         Extract metadata from statement message.
         
@@ -144,21 +256,24 @@ class StatementMessageProcessor:
         Returns:
             Dict: Extracted metadata including template info
         """
-        metadata = message.get('metadata', {})
+        get = _parse_message(message).get
+        metadata_get = get('metadata', {}).get
         
+        # A dict display with constant keys builds in one step, cheaper than
+        # filling a dict key by key
         return {
-            'statement_id': message.get('statement_id'),
-            'customer_id': message.get('customer_id'),
-            'statement_date': message.get('statement_date'),
-            'statement_type': message.get('statement_type', 'monthly'),
-            'template_name': metadata.get('template_name', 'monthly'),
-            'template_version': metadata.get('template_version', '1.0'),
-            'currency': metadata.get('currency', 'USD'),
-            'processing_timestamp': metadata.get('processing_timestamp')
+            'statement_id': get('statement_id'),
+            'customer_id': get('customer_id'),
+            'statement_date': get('statement_date'),
+            'statement_type': get('statement_type', 'monthly'),
+            'template_name': metadata_get('template_name', 'monthly'),
+            'template_version': metadata_get('template_version', '1.0'),
+            'currency': metadata_get('currency', 'USD'),
+            'processing_timestamp': metadata_get('processing_timestamp'),
         }
     
     @staticmethod
-    def extract_financial_data(message: Dict) -> Dict:
+    def extract_financial_data(message: Union[Dict, bytes, str]) -> Dict:
         """
         Extract financial data from statement message.
         
@@ -168,11 +283,17 @@ class StatementMessageProcessor:
         Returns:
             Dict: Organized financial data
         """
-        return {
-            'customer_info': message.get('customer_info', {}),
-            'account_summary': message.get('account_summary', {}),
-            'transactions': message.get('transactions', []),
-            'balances': message.get('balances', {}),
-            'line_items': message.get('line_items', []),
-            'totals': message.get('totals', {})
-        }
\ No newline at end of file
+        get = _parse_message(message).get
+        financial_data = {
+            'customer_info': get('customer_info', {}),
+            'account_summary': get('account_summary', {}),
+            'transactions': get('transactions', []),
+            'balances': get('balances', {}),
+            'line_items': get('line_items', []),
+            'totals': get('totals', {}),
+        }
+        
+        if simdjson is not None:
+            # Sections of a simdjson document only live until the next parse
+            financial_data = {key: _materialize(value) for key, value in financial_data.items()}
+        return financial_data
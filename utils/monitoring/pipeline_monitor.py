@@ -1,18 +1,43 @@
 """
 Comprehensive monitoring and error handling for the financial statement pipeline.
 """
+import bisect
 import logging
-import json
+import os
+import queue
 import time
+from collections import deque
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence
 from dataclasses import dataclass
 from enum import Enum
+import sys
 import threading
 from pathlib import Path
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+try:
+    # C-implemented structs, installed with the "performance" extra
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if msgspec is not None:
+    # Structs are slotted and construct in C; annotations become fields
+    _RecordBase = msgspec.Struct
+
+    def _record(cls):
+        return cls
+else:
+    _RecordBase = object
+    # Slotted dataclasses need Python 3.10; hand-written __slots__ would
+    # clash with field defaults. Older interpreters keep the instance __dict__.
+    _record = dataclass(**({'slots': True} if sys.version_info >= (3, 10) else {}))
+
 
 class AlertLevel(Enum):
     """Alert severity levels."""
@@ -30,8 +55,8 @@ class MetricType(Enum):
     TIMER = "timer"
 
 
-@dataclass
-class PipelineAlert:
+@_record
+class PipelineAlert(_RecordBase):
     """Represents a pipeline alert."""
     timestamp: datetime
     level: AlertLevel
@@ -41,8 +66,8 @@ class PipelineAlert:
     resolved: bool = False
 
 
-@dataclass
-class PipelineMetric:
+@_record
+class PipelineMetric(_RecordBase):
     """Represents a pipeline metric."""
     name: str
     type: MetricType
@@ -56,61 +81,87 @@ class PipelineMetrics:
     Collects and manages pipeline metrics.
     """
     
-    def __init__(self):
+    def __init__(self, max_metrics: int = 100_000):
         """Initialize metrics collection."""
-        self._metrics: List[PipelineMetric] = []
-        self._counters: Dict[str, float] = {}
+        # Bounded history of (time.monotonic_ns(), name, type, value, tags)
+        # rows. Plain tuples are cheaper to build than PipelineMetric objects,
+        # which are only made for the rows a query returns. A single
+        # deque.append is atomic, and rows are in time order, so recent
+        # metrics can be bisected without taking a lock.
+        self._metrics: deque = deque(maxlen=max_metrics)
+        # Wall clock reference for turning recorded monotonic times into
+        # datetimes when metrics are read
+        self._epoch_wall = datetime.utcnow()
+        self._epoch_ns = time.monotonic_ns()
         self._gauges: Dict[str, float] = {}
-        self._timers: Dict[str, List[float]] = {}
+        # Counters and timer aggregates are kept per thread, so updates never
+        # contend; readers sum across the registered shards
+        self._local = threading.local()
+        self._shards: List[tuple] = []
         self._lock = threading.Lock()
     
+    def _get_shard(self) -> tuple:
+        """Return this thread's (counters, timers) shard, registering it on first use."""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = ({}, {})
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+    
+    def record_batch(self, updates: Sequence[tuple]):
+        """
+        Record several metrics with one timestamp.
+        
+        Args:
+            updates: (name, MetricType, value, tags) tuples, applied in order;
+                tags may be None
+        """
+        counters, timers = self._get_shard()
+        append = self._metrics.append
+        now_ns = time.monotonic_ns()
+        
+        for name, metric_type, value, tags in updates:
+            if metric_type is MetricType.COUNTER:
+                counters[name] = counters.get(name, 0) + value
+                recorded = self.get_counter(name)
+            elif metric_type is MetricType.GAUGE:
+                self._gauges[name] = recorded = value
+            elif metric_type is MetricType.TIMER:
+                # Running (count, sum, min, max); stored as one tuple so
+                # readers on other threads always see a consistent set
+                stats = timers.get(name)
+                if stats is None:
+                    timers[name] = (1, value, value, value)
+                else:
+                    count, total, low, high = stats
+                    timers[name] = (
+                        count + 1,
+                        total + value,
+                        value if value < low else low,
+                        value if value > high else high
+                    )
+                recorded = value
+            else:
+                raise ValueError(f"Unsupported metric type: {metric_type}")
+            
+            append((now_ns, name, metric_type, recorded, tags))
+    
     def increment_counter(self, name: str, value: float = 1.0, tags: Optional[Dict[str, str]] = None):
         """Increment a counter metric."""
-        with self._lock:
-            self._counters[name] = self._counters.get(name, 0) + value
-            
-            metric = PipelineMetric(
-                name=name,
-                type=MetricType.COUNTER,
-                value=self._counters[name],
-                timestamp=datetime.utcnow(),
-                tags=tags or {}
-            )
-            self._metrics.append(metric)
+        self.record_batch(((name, MetricType.COUNTER, value, tags),))
     
     def set_gauge(self, name: str, value: float, tags: Optional[Dict[str, str]] = None):
         """Set a gauge metric."""
-        with self._lock:
-            self._gauges[name] = value
-            
-            metric = PipelineMetric(
-                name=name,
-                type=MetricType.GAUGE,
-                value=value,
-                timestamp=datetime.utcnow(),
-                tags=tags or {}
-            )
-            self._metrics.append(metric)
+        self.record_batch(((name, MetricType.GAUGE, value, tags),))
     
     def record_timer(self, name: str, duration: float, tags: Optional[Dict[str, str]] = None):
         """Record a timer metric."""
-        with self._lock:
-            if name not in self._timers:
-                self._timers[name] = []
-            self._timers[name].append(duration)
-            
-            metric = PipelineMetric(
-                name=name,
-                type=MetricType.TIMER,
-                value=duration,
-                timestamp=datetime.utcnow(),
-                tags=tags or {}
-            )
-            self._metrics.append(metric)
+        self.record_batch(((name, MetricType.TIMER, duration, tags),))
     
     def get_counter(self, name: str) -> float:
         """Get current counter value."""
-        return self._counters.get(name, 0.0)
+        return sum((counters[name] for counters, _ in self._shards if name in counters), 0.0)
     
     def get_gauge(self, name: str) -> float:
         """Get current gauge value."""
@@ -118,29 +169,53 @@ class PipelineMetrics:
     
     def get_timer_stats(self, name: str) -> Dict[str, float]:
         """Get timer statistics."""
-        if name not in self._timers or not self._timers[name]:
+        shard_stats = [timers[name] for _, timers in self._shards if name in timers]
+        if not shard_stats:
             return {}
         
-        values = self._timers[name]
+        count = sum(stats[0] for stats in shard_stats)
+        total = sum(stats[1] for stats in shard_stats)
         return {
-            'count': len(values),
-            'sum': sum(values),
-            'min': min(values),
-            'max': max(values),
-            'avg': sum(values) / len(values)
+            'count': count,
+            'sum': total,
+            'min': min(stats[2] for stats in shard_stats),
+            'max': max(stats[3] for stats in shard_stats),
+            'avg': total / count
         }
     
     def get_recent_metrics(self, minutes: int = 60) -> List[PipelineMetric]:
         """Get metrics from the last N minutes."""
-        cutoff = datetime.utcnow() - timedelta(minutes=minutes)
-        return [m for m in self._metrics if m.timestamp >= cutoff]
+        history = self._metrics
+        # A 1-tuple sorts before any row with the same time, so only the
+        # time column is ever compared
+        start = bisect.bisect_left(history, (time.monotonic_ns() - minutes * 60_000_000_000,))
+        rows = list(islice(reversed(history), len(history) - start))
+        rows.reverse()
+        
+        epoch_wall = self._epoch_wall
+        epoch_ns = self._epoch_ns
+        return [
+            PipelineMetric(
+                name, metric_type, value,
+                epoch_wall + timedelta(microseconds=(recorded_ns - epoch_ns) // 1000),
+                tags or {}
+            )
+            for recorded_ns, name, metric_type, value, tags in rows
+        ]
+    
+    def _metric_names(self, kind: int) -> List[str]:
+        """Names of the counters (kind 0) or timers (kind 1) seen on any thread."""
+        names = {}
+        for shard in list(self._shards):
+            names.update(dict.fromkeys(list(shard[kind])))
+        return list(names)
     
     def export_metrics(self) -> Dict[str, Any]:
         """Export all metrics for external monitoring systems."""
         return {
-            'counters': self._counters.copy(),
+            'counters': {name: self.get_counter(name) for name in self._metric_names(0)},
             'gauges': self._gauges.copy(),
-            'timer_stats': {name: self.get_timer_stats(name) for name in self._timers},
+            'timer_stats': {name: self.get_timer_stats(name) for name in self._metric_names(1)},
             'export_timestamp': datetime.utcnow().isoformat()
         }
 
@@ -152,7 +227,11 @@ class PipelineAlertManager:
     
     def __init__(self, max_alerts: int = 1000):
         """Initialize alert manager."""
-        self._alerts: List[PipelineAlert] = []
+        # Oldest alerts are evicted as new ones arrive past max_alerts.
+        # _alert_times holds each alert's time.monotonic(), appended with it
+        # under the lock, so recent alerts can be bisected.
+        self._alerts: deque = deque(maxlen=max_alerts)
+        self._alert_times: deque = deque(maxlen=max_alerts)
         self._max_alerts = max_alerts
         self._lock = threading.Lock()
         self._alert_handlers = {
@@ -174,10 +253,7 @@ class PipelineAlertManager:
         
         with self._lock:
             self._alerts.append(alert)
-            
-            # Maintain alert limit
-            if len(self._alerts) > self._max_alerts:
-                self._alerts = self._alerts[-self._max_alerts:]
+            self._alert_times.append(time.monotonic())
         
         # Handle alert
         self._handle_alert(alert)
@@ -209,11 +285,18 @@ class PipelineAlertManager:
     
     def get_recent_alerts(self, level: Optional[AlertLevel] = None, hours: int = 24) -> List[PipelineAlert]:
         """Get recent alerts, optionally filtered by level."""
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
-        alerts = [a for a in self._alerts if a.timestamp >= cutoff]
+        cutoff = time.monotonic() - hours * 3600
         
-        if level:
-            alerts = [a for a in alerts if a.level == level]
+        # The lock keeps concurrent appends from shifting the deques between
+        # the bisect and the copy
+        with self._lock:
+            start = bisect.bisect_left(self._alert_times, cutoff)
+            recent = islice(reversed(self._alerts), len(self._alerts) - start)
+            if level:
+                alerts = [a for a in recent if a.level == level]
+            else:
+                alerts = list(recent)
+        alerts.reverse()
         
         return alerts
     
@@ -221,7 +304,9 @@ class PipelineAlertManager:
         """Get summary of alert counts by level."""
         summary = {level.value: 0 for level in AlertLevel}
         
-        for alert in self._alerts:
+        with self._lock:
+            alerts = list(self._alerts)
+        for alert in alerts:
             summary[alert.level.value] += 1
         
         return summary
@@ -232,10 +317,14 @@ class PipelineHealthChecker:
     Monitors pipeline health and performance.
     """
     
-    def __init__(self, metrics: PipelineMetrics, alerts: PipelineAlertManager):
+    def __init__(self, metrics: PipelineMetrics, alerts: PipelineAlertManager, health_cache_ttl: float = 1.0):
         """Initialize health checker."""
         self.metrics = metrics
         self.alerts = alerts
+        # (time.monotonic() when built, status) of the last overall health
+        # status, reused for health_cache_ttl seconds
+        self.health_cache_ttl = health_cache_ttl
+        self._health_cache: Optional[tuple] = None
         self.health_thresholds = {
             'kafka_lag_seconds': 300,  # 5 minutes
             'processing_time_seconds': 600,  # 10 minutes
@@ -328,29 +417,34 @@ class PipelineHealthChecker:
     
     def get_overall_health_status(self) -> Dict[str, Any]:
         """Get overall health status."""
+        now = time.monotonic()
+        cached = self._health_cache
+        if cached is not None and now - cached[0] < self.health_cache_ttl:
+            return cached[1]
+        
         try:
-            recent_alerts = self.alerts.get_recent_alerts(hours=1)
-            critical_alerts = [a for a in recent_alerts if a.level == AlertLevel.CRITICAL]
-            error_alerts = [a for a in recent_alerts if a.level == AlertLevel.ERROR]
-            warning_alerts = [a for a in recent_alerts if a.level == AlertLevel.WARNING]
+            # Count the last hour's alerts by level in one pass
+            alert_counts = dict.fromkeys(AlertLevel, 0)
+            for alert in self.alerts.get_recent_alerts(hours=1):
+                alert_counts[alert.level] += 1
             
-            if critical_alerts:
+            if alert_counts[AlertLevel.CRITICAL]:
                 health_status = "critical"
-            elif error_alerts:
+            elif alert_counts[AlertLevel.ERROR]:
                 health_status = "error"
-            elif warning_alerts:
+            elif alert_counts[AlertLevel.WARNING]:
                 health_status = "warning"
             else:
                 health_status = "healthy"
             
-            return {
+            status = {
                 'status': health_status,
                 'timestamp': datetime.utcnow().isoformat(),
                 'recent_alerts': {
-                    'critical': len(critical_alerts),
-                    'error': len(error_alerts),
-                    'warning': len(warning_alerts),
-                    'info': len([a for a in recent_alerts if a.level == AlertLevel.INFO])
+                    'critical': alert_counts[AlertLevel.CRITICAL],
+                    'error': alert_counts[AlertLevel.ERROR],
+                    'warning': alert_counts[AlertLevel.WARNING],
+                    'info': alert_counts[AlertLevel.INFO]
                 },
                 'key_metrics': {
                     'kafka_lag_seconds': self.metrics.get_gauge('kafka_lag_seconds'),
@@ -358,6 +452,8 @@ class PipelineHealthChecker:
                     'throughput_mps': self.metrics.get_gauge('throughput_messages_per_second')
                 }
             }
+            self._health_cache = (now, status)
+            return status
             
         except Exception as e:
             logger.error(f"Error getting health status: {str(e)}")
@@ -379,12 +475,21 @@ class PipelineMonitor:
         self.alerts = PipelineAlertManager()
         self.health_checker = PipelineHealthChecker(self.metrics, self.alerts)
         self.start_time = datetime.utcnow()
+        # (output path, dashboard snapshot) pairs for the export writer thread,
+        # which is started on the first export
+        self._export_queue: queue.Queue = queue.Queue(maxsize=4)
+        self._export_thread: Optional[threading.Thread] = None
+        self._export_lock = threading.Lock()
+        # Held while a snapshot is written, so exports land in order
+        self._write_lock = threading.Lock()
     
     def track_kafka_consumption(self, message_count: int, duration: float, errors: int = 0):
         """Track Kafka consumption metrics."""
-        self.metrics.increment_counter('messages_consumed_total', message_count)
-        self.metrics.increment_counter('kafka_errors_total', errors)
-        self.metrics.record_timer('kafka_consumption_duration', duration)
+        self.metrics.record_batch((
+            ('messages_consumed_total', MetricType.COUNTER, message_count, None),
+            ('kafka_errors_total', MetricType.COUNTER, errors, None),
+            ('kafka_consumption_duration', MetricType.TIMER, duration, None),
+        ))
         
         if errors > 0:
             self.alerts.create_alert(
@@ -396,13 +501,14 @@ class PipelineMonitor:
     
     def track_validation(self, total_messages: int, valid_messages: int, invalid_messages: int, duration: float):
         """Track validation metrics."""
-        self.metrics.increment_counter('messages_validated_total', total_messages)
-        self.metrics.increment_counter('messages_valid_total', valid_messages)
-        self.metrics.increment_counter('messages_invalid_total', invalid_messages)
-        self.metrics.record_timer('validation_duration', duration)
-        
         validation_rate = (valid_messages / total_messages * 100) if total_messages > 0 else 0
-        self.metrics.set_gauge('validation_success_rate', validation_rate)
+        self.metrics.record_batch((
+            ('messages_validated_total', MetricType.COUNTER, total_messages, None),
+            ('messages_valid_total', MetricType.COUNTER, valid_messages, None),
+            ('messages_invalid_total', MetricType.COUNTER, invalid_messages, None),
+            ('validation_duration', MetricType.TIMER, duration, None),
+            ('validation_success_rate', MetricType.GAUGE, validation_rate, None),
+        ))
         
         if invalid_messages > 0:
             self.alerts.create_alert(
@@ -414,14 +520,15 @@ class PipelineMonitor:
     
     def track_pdf_generation(self, total_pdfs: int, successful_pdfs: int, failed_pdfs: int, duration: float, total_size: int):
         """Track PDF generation metrics."""
-        self.metrics.increment_counter('pdfs_generated_total', total_pdfs)
-        self.metrics.increment_counter('pdfs_successful_total', successful_pdfs)
-        self.metrics.increment_counter('pdfs_failed_total', failed_pdfs)
-        self.metrics.record_timer('pdf_generation_duration', duration)
-        self.metrics.set_gauge('pdf_total_size_bytes', total_size)
-        
         success_rate = (successful_pdfs / total_pdfs * 100) if total_pdfs > 0 else 0
-        self.metrics.set_gauge('pdf_success_rate', success_rate)
+        self.metrics.record_batch((
+            ('pdfs_generated_total', MetricType.COUNTER, total_pdfs, None),
+            ('pdfs_successful_total', MetricType.COUNTER, successful_pdfs, None),
+            ('pdfs_failed_total', MetricType.COUNTER, failed_pdfs, None),
+            ('pdf_generation_duration', MetricType.TIMER, duration, None),
+            ('pdf_total_size_bytes', MetricType.GAUGE, total_size, None),
+            ('pdf_success_rate', MetricType.GAUGE, success_rate, None),
+        ))
         
         if failed_pdfs > 0:
             self.alerts.create_alert(
@@ -433,11 +540,14 @@ class PipelineMonitor:
     
     def track_pipeline_execution(self, execution_id: str, duration: float, success: bool, summary: Dict):
         """Track overall pipeline execution."""
-        self.metrics.increment_counter('pipeline_executions_total')
-        self.metrics.record_timer('pipeline_execution_duration', duration)
+        outcome_counter = 'pipeline_executions_successful' if success else 'pipeline_executions_failed'
+        self.metrics.record_batch((
+            ('pipeline_executions_total', MetricType.COUNTER, 1.0, None),
+            ('pipeline_execution_duration', MetricType.TIMER, duration, None),
+            (outcome_counter, MetricType.COUNTER, 1.0, None),
+        ))
         
         if success:
-            self.metrics.increment_counter('pipeline_executions_successful')
             self.alerts.create_alert(
                 AlertLevel.INFO,
                 'pipeline_execution',
@@ -445,7 +555,6 @@ class PipelineMonitor:
                 summary
             )
         else:
-            self.metrics.increment_counter('pipeline_executions_failed')
             self.alerts.create_alert(
                 AlertLevel.ERROR,
                 'pipeline_execution',
@@ -483,12 +592,81 @@ class PipelineMonitor:
         }
     
     def export_monitoring_data(self, output_path: Path):
-        """Export monitoring data to file."""
+        """
+        Export monitoring data to file.
+        
+        The dashboard snapshot is taken on the calling thread. It is written
+        there too unless another export is still pending, in which case it
+        is queued for a background thread so the caller does not wait on
+        disk I/O; use wait_for_exports to block until those are written.
+        
+        Args:
+            output_path: File to write the monitoring data to
+        """
         try:
             data = self.get_monitoring_dashboard_data()
             
-            with open(output_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            # The writer is a daemon thread, so only overlapping exports go
+            # through it; a process that exports once and exits loses nothing
+            if self._write_lock.acquire(blocking=False):
+                try:
+                    if self._export_queue.empty():
+                        self._write_export(output_path, data)
+                        return
+                finally:
+                    self._write_lock.release()
+            
+            self._start_export_writer()
+            self._export_queue.put_nowait((output_path, data))
+            
+        except queue.Full:
+            logger.warning(f"Monitoring export queue full, skipping export to {output_path}")
+        except Exception as e:
+            logger.error(f"Error exporting monitoring data: {str(e)}")
+    
+    def wait_for_exports(self):
+        """Block until every queued monitoring export has been written."""
+        self._export_queue.join()
+    
+    def _start_export_writer(self):
+        """Start the export writer thread if it is not running yet."""
+        if self._export_thread is not None:
+            return
+        with self._export_lock:
+            if self._export_thread is None:
+                thread = threading.Thread(
+                    target=self._export_writer, name='monitoring-export', daemon=True
+                )
+                thread.start()
+                self._export_thread = thread
+    
+    def _export_writer(self):
+        """Write queued monitoring snapshots until the process exits."""
+        while True:
+            output_path, data = self._export_queue.get()
+            try:
+                with self._write_lock:
+                    self._write_export(output_path, data)
+            finally:
+                self._export_queue.task_done()
+    
+    @staticmethod
+    def _write_export(output_path: Path, data: Dict[str, Any]):
+        """Serialize a snapshot and atomically replace the export file."""
+        try:
+            # orjson serializes datetimes and enums natively; default=str
+            # only catches anything else a caller put into alert details
+            payload = orjson.dumps(
+                data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                default=str
+            )
+            # Written beside the target and renamed over it, so readers never
+            # see a partially written file
+            tmp_path = f"{output_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, output_path)
             
             logger.info(f"Monitoring data exported to {output_path}")
             
@@ -1,6 +1,6 @@
 """
 PDF generation utilities for financial statement processing.
 """
-from .pdf_generator import PDFGenerator, PDFMetadataInjector
+from .pdf_generator import PDFGenerator, PDFMetadataInjector, PDFWriteResult
 
-__all__ = ['PDFGenerator', 'PDFMetadataInjector']
\ No newline at end of file
+__all__ = ['PDFGenerator', 'PDFMetadataInjector', 'PDFWriteResult']
\ No newline at end of file
@@ -1,26 +1,258 @@
 """
 PDF generation module for financial statements using ReportLab.
 """
+import hashlib
 import io
+import itertools
 import logging
+import multiprocessing
+import os
+import queue
+import shutil
+import string
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Optional, Union
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterator, NamedTuple, Optional, Union
 from datetime import datetime
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.units import inch
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.colors import HexColor, black, white
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.platypus.flowables import HRFlowable
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
 from config.airflow_config import PDF_CONFIG, OUTPUT_DIR
 from utils.templates.template_manager import TemplateManager
-import weasyprint
+
+# ReportLab and WeasyPrint are imported where they are used: each costs a
+# noticeable share of process start-up, and most processes, pool workers
+# included, only ever need one of them. The first render in a process pays
+# the import.
+if TYPE_CHECKING:
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.platypus import TableStyle
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
 
 logger = logging.getLogger(__name__)
 
+# Write buffer for PDF files and chunk size for streamed PDFs
+_PDF_BUFFER_SIZE = 1 << 20
+_STREAM_CHUNK_SIZE = 64 * 1024
+# Bytes at the end of a PDF searched for its %%EOF marker, which writers may
+# follow with line endings or padding
+_PDF_TRAILER_WINDOW = 32
+# Render cache stores between prunes of expired and excess entries
+_RENDER_CACHE_PRUNE_INTERVAL = 64
+
+# Currency cells in the ReportLab tables
+_format_amount = "${:,.2f}".format
+
+# Bytes dropped from IDs used in PDF filenames: all but ASCII letters,
+# digits, '-' and '_'
+_SAFE_FILENAME_BYTES = frozenset((string.ascii_letters + string.digits + '-_').encode())
+_UNSAFE_FILENAME_BYTES = bytes(b for b in range(256) if b not in _SAFE_FILENAME_BYTES)
+
+
+def _clean_filename_part(value: str) -> str:
+    """Reduce an ID to filename-safe characters, truncated to 20."""
+    # Non-ASCII characters go in the encode, the rest in one translate pass
+    return value.encode('ascii', 'ignore').translate(None, _UNSAFE_FILENAME_BYTES).decode('ascii')[:20]
+
+
+def _new_filename_sequence():
+    """
+    Start this process's PDF filename sequence.
+    
+    Filenames end in a token unique to the process and a running counter, so
+    they never collide within a batch, across pool workers or across runs.
+    Forked children start a sequence of their own.
+    """
+    global _filename_token, _filename_counter
+    seed = f"{os.getpid()}:{time.time_ns()}".encode()
+    _filename_token = hashlib.blake2b(seed, digest_size=4).hexdigest()
+    _filename_counter = itertools.count()
+
+
+_new_filename_sequence()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_new_filename_sequence)
+
+
+@lru_cache(maxsize=1)
+def _shared_font_config() -> "FontConfiguration":
+    """
+    FontConfiguration shared by every WeasyPrint render in this process.
+    
+    Creating one queries fontconfig for the system fonts; reusing it keeps
+    that lookup and any @font-face fonts loaded by the templates warm
+    across statements and PDFGenerator instances.
+    """
+    from weasyprint.text.fonts import FontConfiguration
+    return FontConfiguration()
+
+
+@lru_cache(maxsize=16)
+def _parsed_stylesheet(css_path: Path, mtime_ns: int) -> "CSS":
+    """
+    Template stylesheet, parsed once per process and reused by every render.
+    
+    mtime_ns is part of the cache key only, so an edited stylesheet is
+    parsed again.
+    """
+    import weasyprint
+    return weasyprint.CSS(filename=str(css_path), font_config=_shared_font_config())
+
+
+# Decoded images from the templates (logos, signatures), kept for every
+# WeasyPrint render in this process; WeasyPrint takes a dict as its cache
+_IMAGE_CACHE: Dict = {}
+
+
+@lru_cache(maxsize=4)
+def _worker_generator(output_dir: str) -> "PDFGenerator":
+    """PDFGenerator shared by the batch renders in one pool worker process."""
+    return PDFGenerator(output_dir=Path(output_dir))
+
+
+def _render_one(output_dir: str, statement_data: Dict) -> Optional[Path]:
+    """Render one statement in a pool worker; module level so it pickles."""
+    result = _worker_generator(output_dir).generate_statement_pdf(statement_data)
+    return result.path if result else None
+
+
+def render_statement_result(output_dir: str, statement_data: Dict) -> Dict:
+    """
+    Render and validate one statement in a pool worker.
+    
+    Errors are returned as failed results rather than raised, so a chunked
+    map over a batch carries on past a bad statement.
+    
+    Args:
+        output_dir: Directory to save generated PDFs
+        statement_data: Validated statement data
+        
+    Returns:
+        Dict: Generation result for the statement
+    """
+    try:
+        pdf_generator = _worker_generator(output_dir)
+        result = pdf_generator.generate_statement_pdf(statement_data)
+        
+        if result and pdf_generator.validate_pdf_output(result.path, result.size):
+            return {
+                'success': True,
+                'pdf_path': str(result.path),
+                'file_size': result.size
+            }
+    except Exception as e:
+        logger.error(f"Error generating PDF for {statement_data.get('statement_id')}: {str(e)}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+    
+    return {
+        'success': False,
+        'error': 'PDF generation or validation failed'
+    }
+
+
+def render_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for PDF rendering.
+    
+    Workers start from a forkserver, or spawn where that is unavailable,
+    never from a fork of the caller: an Airflow task process runs logging
+    and heartbeat threads, and a forked child can inherit their locks held.
+    Work submitted to the pool must live in an importable module.
+    
+    Args:
+        max_workers: Worker processes to start
+        
+    Returns:
+        ProcessPoolExecutor: Pool using the safe start method
+    """
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context(start_method)
+    )
+
+
+class _ReportLabStyles(NamedTuple):
+    """Paragraph and table styles used by generate_pdf_reportlab."""
+    title: "ParagraphStyle"
+    heading: "ParagraphStyle"
+    body: "ParagraphStyle"
+    footer: "ParagraphStyle"
+    balance_table: "TableStyle"
+    transaction_table: "TableStyle"
+
+
+@lru_cache(maxsize=1)
+def _reportlab_styles() -> _ReportLabStyles:
+    """Build the ReportLab styles from PDF_CONFIG once per process."""
+    from reportlab.lib import colors
+    from reportlab.lib.colors import HexColor
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+    
+    styles = getSampleStyleSheet()
+    font_size = PDF_CONFIG['font_size']
+    
+    header_commands = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ]
+    body_commands = [
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]
+    
+    return _ReportLabStyles(
+        title=ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=font_size['title'],
+            spaceAfter=30,
+            alignment=TA_CENTER
+        ),
+        heading=ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=font_size['heading'],
+            spaceAfter=12,
+            textColor=HexColor('#2c5f7d')
+        ),
+        body=ParagraphStyle(
+            'CustomBody',
+            parent=styles['Normal'],
+            fontSize=font_size['body'],
+            spaceAfter=6
+        ),
+        footer=ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, alignment=TA_CENTER),
+        balance_table=TableStyle(header_commands + [
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ] + body_commands),
+        transaction_table=TableStyle(header_commands + [
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('ALIGN', (2, 0), (2, -1), 'RIGHT'),  # Right-align amounts
+        ] + body_commands),
+    )
+
+
+class _RenderedStatement(NamedTuple):
+    """Statement with its rendered HTML; html_content is None for ReportLab templates."""
+    statement_data: Dict
+    html_content: Optional[str]
+    stylesheet: Optional[Path] = None
+
+
+class PDFWriteResult(NamedTuple):
+    """Location and byte size of a generated PDF."""
+    path: Path
+    size: int
+
 
 class PDFGenerator:
     """
@@ -39,32 +271,99 @@ class PDFGenerator:
         self.config = PDF_CONFIG
         self.template_manager = TemplateManager()
         
-    def generate_pdf_from_html(self, html_content: str, output_path: Path) -> bool:
+        self._render_cache_dir = None
+        if self.config.get('render_cache', False):
+            self._render_cache_dir = self.output_dir / '.cache'
+            self._render_cache_dir.mkdir(exist_ok=True)
+            self._render_cache_ttl = self.config.get('render_cache_ttl', 86400)
+            self._render_cache_max_entries = self.config.get('render_cache_max_entries', 1000)
+            self._render_cache_stores = 0
+            self._prune_render_cache()
+    
+    @property
+    def font_config(self) -> "FontConfiguration":
+        """WeasyPrint font configuration, loaded on first use."""
+        return _shared_font_config()
+        
+    def generate_pdf_from_html(self, html_content: str, output: Union[Path, BinaryIO]) -> bool:
         """
         Generate PDF from HTML content using WeasyPrint.
         
         Args:
             html_content: Rendered HTML content
-            output_path: Path to save the PDF
+            output: Path to save the PDF, or a writable binary stream
             
         Returns:
             bool: True if successful, False otherwise
         """
+        if isinstance(output, (str, os.PathLike)):
+            return self._write_pdf_from_html(html_content, Path(output)) is not None
+        
+        try:
+            import weasyprint
+            weasyprint.HTML(string=html_content).write_pdf(output, font_config=self.font_config, cache=_IMAGE_CACHE)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error generating PDF from HTML: {str(e)}")
+            return False
+    
+    def generate_pdf_stream(self, html_content: str, chunk_size: int = _STREAM_CHUNK_SIZE) -> Optional[Iterator[bytes]]:
+        """
+        Render a PDF and return it as an iterator of byte chunks.
+        
+        The document is rendered before this returns, so a failed render is
+        reported as None rather than partway through a response body.
+        
+        Args:
+            html_content: Rendered HTML content
+            chunk_size: Maximum size of each chunk in bytes
+            
+        Returns:
+            Optional[Iterator[bytes]]: PDF content in chunks, or None if failed
+        """
+        buffer = io.BytesIO()
+        if not self.generate_pdf_from_html(html_content, buffer):
+            return None
+        
+        buffer.seek(0)
+        return iter(partial(buffer.read, chunk_size), b'')
+    
+    def _write_pdf_from_html(self, html_content: str, output_path: Path,
+                             stylesheet: Optional[Path] = None) -> Optional[int]:
+        """
+        Write a PDF rendered by WeasyPrint and report how many bytes were written.
+        
+        Args:
+            html_content: Rendered HTML content
+            output_path: Path to save the PDF
+            stylesheet: Template stylesheet to apply along with the HTML
+            
+        Returns:
+            Optional[int]: Size of the written PDF in bytes, or None if failed
+        """
         try:
             # Configure WeasyPrint
+            import weasyprint
             html_doc = weasyprint.HTML(string=html_content)
+            stylesheets = None
+            if stylesheet:
+                stylesheets = [_parsed_stylesheet(stylesheet, os.stat(stylesheet).st_mtime_ns)]
             
-            # Generate PDF
-            html_doc.write_pdf(str(output_path))
+            # Generate PDF; the writer position is the file size, no stat needed
+            with open(output_path, 'wb', buffering=_PDF_BUFFER_SIZE) as f:
+                html_doc.write_pdf(f, stylesheets=stylesheets, font_config=self.font_config,
+                                   cache=_IMAGE_CACHE)
+                size = f.tell()
             
             logger.info(f"Successfully generated PDF: {output_path}")
-            return True
+            return size
             
         except Exception as e:
             logger.error(f"Error generating PDF from HTML: {str(e)}")
-            return False
+            return None
     
-    def generate_statement_pdf(self, statement_data: Dict, template_name: Optional[str] = None) -> Optional[Path]:
+    def generate_statement_pdf(self, statement_data: Dict, template_name: Optional[str] = None) -> Optional[PDFWriteResult]:
         """
         Generate a complete financial statement PDF.
         
@@ -73,7 +372,20 @@ class PDFGenerator:
             template_name: Override template selection
             
         Returns:
-            Optional[Path]: Path to generated PDF or None if failed
+            Optional[PDFWriteResult]: Path and size of generated PDF or None if failed
+        """
+        return self._write_statement_pdf(self._render_statement(statement_data, template_name))
+    
+    def _render_statement(self, statement_data: Dict, template_name: Optional[str] = None) -> Optional[_RenderedStatement]:
+        """
+        First stage of generate_statement_pdf: select the template and render its HTML.
+        
+        Args:
+            statement_data: Validated statement data
+            template_name: Override template selection
+            
+        Returns:
+            Optional[_RenderedStatement]: Rendered statement or None if failed
         """
         try:
             # Select template
@@ -86,23 +398,145 @@ class PDFGenerator:
                 logger.error("No template found for statement generation")
                 return None
             
+            # Templates without paged CSS can opt into the lighter ReportLab layout
+            if self.template_manager.get_engine(template) == 'reportlab':
+                return _RenderedStatement(statement_data, None)
+            
             # Render HTML content
             html_content = self.template_manager.render_template(template, statement_data)
+            return _RenderedStatement(
+                statement_data, html_content, self.template_manager.get_stylesheet(template)
+            )
+                
+        except Exception as e:
+            logger.error(f"Error generating statement PDF: {str(e)}")
+            return None
+    
+    def _write_statement_pdf(self, rendered: Optional[_RenderedStatement]) -> Optional[PDFWriteResult]:
+        """
+        Second stage of generate_statement_pdf: lay out and write the PDF.
+        
+        Args:
+            rendered: Output of _render_statement
+            
+        Returns:
+            Optional[PDFWriteResult]: Path and size of generated PDF or None if failed
+        """
+        if rendered is None:
+            return None
+        
+        try:
+            statement_data, html_content, stylesheet = rendered
+            if html_content is None:
+                pdf_path = self.generate_pdf_reportlab(statement_data)
+                if pdf_path is None:
+                    return None
+                return PDFWriteResult(pdf_path, pdf_path.stat().st_size)
             
             # Generate output filename
             output_filename = self._generate_filename(statement_data)
             output_path = self.output_dir / output_filename
             
+            # Identical HTML gives an identical PDF, so a cached render can
+            # stand in for WeasyPrint
+            cache_path = self._render_cache_path(html_content, stylesheet)
+            if cache_path is not None:
+                cached = self._copy_cached_pdf(cache_path, output_path)
+                if cached is not None:
+                    return cached
+            
             # Generate PDF
-            if self.generate_pdf_from_html(html_content, output_path):
-                return output_path
-            else:
+            size = self._write_pdf_from_html(html_content, output_path, stylesheet)
+            if size is None:
                 return None
+            
+            if cache_path is not None:
+                self._store_cached_pdf(output_path, cache_path)
+            
+            return PDFWriteResult(output_path, size)
                 
         except Exception as e:
             logger.error(f"Error generating statement PDF: {str(e)}")
             return None
     
+    def _render_cache_path(self, html_content: str, stylesheet: Optional[Path] = None) -> Optional[Path]:
+        """Cache location for the PDF of html_content, or None if caching is off."""
+        if self._render_cache_dir is None:
+            return None
+        digest = hashlib.blake2b(html_content.encode(), digest_size=16)
+        if stylesheet:
+            # The modification time keys the entry to this version of the CSS
+            digest.update(f"{stylesheet}:{os.stat(stylesheet).st_mtime_ns}".encode())
+        digest = digest.hexdigest()
+        return self._render_cache_dir / f"{digest}.pdf"
+    
+    def _copy_cached_pdf(self, cache_path: Path, output_path: Path) -> Optional[PDFWriteResult]:
+        """Copy a cached PDF to output_path; None if there is no live one to copy."""
+        try:
+            cached = os.stat(cache_path)
+            if cached.st_mtime < time.time() - self._render_cache_ttl:
+                return None
+            shutil.copyfile(cache_path, output_path)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Error reading cached PDF {cache_path}: {str(e)}")
+            return None
+        
+        logger.info(f"Reused cached PDF for {output_path}")
+        return PDFWriteResult(output_path, cached.st_size)
+    
+    def _store_cached_pdf(self, pdf_path: Path, cache_path: Path):
+        """Add a generated PDF to the render cache."""
+        # Copy under a name private to this process, then rename, so pool
+        # workers never see a partly written cache entry
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            shutil.copyfile(pdf_path, tmp_path)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Error caching PDF {pdf_path}: {str(e)}")
+            return
+        
+        self._render_cache_stores += 1
+        if self._render_cache_stores % _RENDER_CACHE_PRUNE_INTERVAL == 0:
+            self._prune_render_cache()
+    
+    def _prune_render_cache(self):
+        """
+        Delete render cache entries past the TTL, then the oldest entries
+        over render_cache_max_entries.
+        
+        Runs when the generator is created and every
+        _RENDER_CACHE_PRUNE_INTERVAL stores, so the cache stays bounded
+        without a directory scan per statement.
+        """
+        expires_before = time.time() - self._render_cache_ttl
+        live = []
+        
+        try:
+            with os.scandir(self._render_cache_dir) as entries:
+                for entry in entries:
+                    try:
+                        mtime = entry.stat().st_mtime
+                        if mtime < expires_before:
+                            os.unlink(entry.path)
+                        else:
+                            live.append((mtime, entry.path))
+                    except FileNotFoundError:
+                        # Removed by another worker pruning the same cache
+                        continue
+            
+            live.sort()
+            for _, path in live[:max(len(live) - self._render_cache_max_entries, 0)]:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    continue
+                    
+        except OSError as e:
+            logger.warning(f"Error pruning PDF render cache: {str(e)}")
+    
     def generate_pdf_reportlab(self, statement_data: Dict) -> Optional[Path]:
         """
         Generate PDF using ReportLab (alternative method).
@@ -114,6 +548,12 @@ class PDFGenerator:
             Optional[Path]: Path to generated PDF or None if failed
         """
         try:
+            from reportlab.lib import colors
+            from reportlab.lib.pagesizes import letter
+            from reportlab.lib.units import inch
+            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, LongTable
+            from reportlab.platypus.flowables import HRFlowable
+            
             # Generate output filename
             output_filename = self._generate_filename(statement_data)
             output_path = self.output_dir / output_filename
@@ -130,31 +570,10 @@ class PDFGenerator:
             
             # Build content
             story = []
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=self.config['font_size']['title'],
-                spaceAfter=30,
-                alignment=TA_CENTER
-            )
-            
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=self.config['font_size']['heading'],
-                spaceAfter=12,
-                textColor=HexColor('#2c5f7d')
-            )
-            
-            body_style = ParagraphStyle(
-                'CustomBody',
-                parent=styles['Normal'],
-                fontSize=self.config['font_size']['body'],
-                spaceAfter=6
-            )
+            styles = _reportlab_styles()
+            title_style = styles.title
+            heading_style = styles.heading
+            body_style = styles.body
             
             # Header
             story.append(Paragraph("Financial Services Corp", title_style))
@@ -175,30 +594,23 @@ class PDFGenerator:
                 story.append(Paragraph("Account Summary", heading_style))
                 
                 balance_data = [['Account Type', 'Opening Balance', 'Closing Balance', 'Net Change']]
-                for account_type, balance in balances.items():
-                    if isinstance(balance, dict):
-                        opening = balance.get('opening_balance', 0)
-                        closing = balance.get('closing_balance', 0)
-                        net_change = closing - opening
-                        balance_data.append([
-                            account_type.title(),
-                            f"${opening:,.2f}",
-                            f"${closing:,.2f}",
-                            f"${net_change:,.2f}"
-                        ])
+                accounts = [(account_type, balance) for account_type, balance in balances.items()
+                            if isinstance(balance, dict)]
+                account_names = [account_type.title() for account_type, _ in accounts]
+                openings = [balance.get('opening_balance', 0) for _, balance in accounts]
+                closings = [balance.get('closing_balance', 0) for _, balance in accounts]
+                balance_data.extend(zip(
+                    account_names,
+                    map(_format_amount, openings),
+                    map(_format_amount, closings),
+                    [_format_amount(closing - opening) for opening, closing in zip(openings, closings)]
+                ))
                 
                 if len(balance_data) > 1:
-                    balance_table = Table(balance_data, colWidths=[2*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-                    balance_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 10),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                    ]))
+                    # LongTable with fixed widths lays rows out once instead of
+                    # re-measuring every cell at each page break
+                    balance_table = LongTable(balance_data, colWidths=[2*inch, 1.5*inch, 1.5*inch, 1.5*inch])
+                    balance_table.setStyle(styles.balance_table)
                     story.append(balance_table)
                     story.append(Spacer(1, 20))
             
@@ -208,26 +620,15 @@ class PDFGenerator:
                 story.append(Paragraph("Recent Transactions", heading_style))
                 
                 trans_data = [['Date', 'Description', 'Amount']]
-                for i, transaction in enumerate(transactions[:10]):  # Show first 10 transactions
-                    trans_data.append([
-                        transaction.get('date', 'N/A')[:10],  # Date only
-                        transaction.get('description', 'N/A')[:40],  # Truncate long descriptions
-                        f"${transaction.get('amount', 0):,.2f}"
-                    ])
+                shown = transactions[:10]  # Show first 10 transactions
+                dates = [t.get('date', 'N/A')[:10] for t in shown]  # Date only
+                descriptions = [t.get('description', 'N/A')[:40] for t in shown]  # Truncate long descriptions
+                amounts = [_format_amount(t.get('amount', 0)) for t in shown]
+                trans_data.extend(zip(dates, descriptions, amounts))
                 
                 if len(trans_data) > 1:
-                    trans_table = Table(trans_data, colWidths=[1.5*inch, 3.5*inch, 1.5*inch])
-                    trans_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('ALIGN', (2, 0), (2, -1), 'RIGHT'),  # Right-align amounts
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 10),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                    ]))
+                    trans_table = LongTable(trans_data, colWidths=[1.5*inch, 3.5*inch, 1.5*inch], repeatRows=1)
+                    trans_table.setStyle(styles.transaction_table)
                     story.append(trans_table)
                 
                 if len(transactions) > 10:
@@ -251,7 +652,7 @@ class PDFGenerator:
             story.append(HRFlowable(width="100%", thickness=1, color=colors.grey))
             story.append(Spacer(1, 12))
             footer_text = f"Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
-            story.append(Paragraph(footer_text, ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, alignment=TA_CENTER)))
+            story.append(Paragraph(footer_text, styles.footer))
             
             # Build PDF
             doc.build(story)
@@ -263,59 +664,73 @@ class PDFGenerator:
             logger.error(f"Error generating ReportLab PDF: {str(e)}")
             return None
     
-    def _generate_filename(self, statement_data: Dict) -> str:
+    def _generate_filename(self, statement_data: Dict, include_timestamp: bool = False) -> str:
         """
         Generate a filename for the PDF based on statement data.
         
         Args:
             statement_data: Statement data
+            include_timestamp: Also add the generation time to the name
             
         Returns:
             str: Generated filename
         """
+        unique = f"{_filename_token}{next(_filename_counter):08d}"
+        if include_timestamp:
+            unique = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{unique}"
+        
         try:
             statement_id = statement_data.get('statement_id', 'unknown')
             customer_id = statement_data.get('customer_id', 'unknown')
             statement_type = statement_data.get('statement_type', 'statement')
             
             # Clean IDs for filename
-            statement_id = ''.join(c for c in statement_id if c.isalnum() or c in '-_')[:20]
-            customer_id = ''.join(c for c in customer_id if c.isalnum() or c in '-_')[:20]
-            
-            # Add timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            statement_id = _clean_filename_part(statement_id)
+            customer_id = _clean_filename_part(customer_id)
             
-            return f"{statement_type}_{customer_id}_{statement_id}_{timestamp}.pdf"
+            return f"{statement_type}_{customer_id}_{statement_id}_{unique}.pdf"
             
         except Exception as e:
             logger.warning(f"Error generating filename: {str(e)}")
-            return f"statement_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            return f"statement_{unique}.pdf"
     
-    def validate_pdf_output(self, pdf_path: Path) -> bool:
+    def validate_pdf_output(self, pdf_path: Path, file_size: Optional[int] = None) -> bool:
         """
         Validate that the generated PDF is valid.
         
         Args:
             pdf_path: Path to the PDF file
+            file_size: Size reported by the writer, skips the stat call if given
             
         Returns:
             bool: True if valid, False otherwise
         """
         try:
-            if not pdf_path.exists():
-                return False
+            fd = os.open(pdf_path, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.error(f"Error validating PDF: {str(e)}")
+            return False
+        
+        try:
+            if file_size is None:
+                file_size = os.fstat(fd).st_size
                 
             # Basic size check
-            if pdf_path.stat().st_size < 1000:  # Less than 1KB is likely invalid
-                logger.warning(f"PDF file too small: {pdf_path.stat().st_size} bytes")
+            if file_size < 1000:  # Less than 1KB is likely invalid
+                logger.warning(f"PDF file too small: {file_size} bytes")
                 return False
             
-            # Check if file starts with PDF header
-            with open(pdf_path, 'rb') as f:
-                header = f.read(4)
-                if header != b'%PDF':
-                    logger.error("Invalid PDF header")
-                    return False
+            # Check the PDF header, and the end-of-file marker a complete
+            # PDF closes with, reading only those bytes
+            if os.pread(fd, 5, 0) != b'%PDF-':
+                logger.error("Invalid PDF header")
+                return False
+            
+            if b'%%EOF' not in os.pread(fd, _PDF_TRAILER_WINDOW, file_size - _PDF_TRAILER_WINDOW):
+                logger.error(f"PDF is truncated, no end-of-file marker: {pdf_path}")
+                return False
             
             logger.debug(f"PDF validation passed: {pdf_path}")
             return True
@@ -323,38 +738,108 @@ class PDFGenerator:
         except Exception as e:
             logger.error(f"Error validating PDF: {str(e)}")
             return False
+        finally:
+            os.close(fd)
     
-    def batch_generate_pdfs(self, statements: list) -> Dict[str, Optional[Path]]:
+    def batch_generate_pdfs(self, statements: list, max_workers: Optional[int] = None) -> Dict[str, Optional[Path]]:
         """
         Generate multiple PDFs in batch.
         
+        Rendering is CPU-bound and holds the GIL, so statements are spread
+        over a process pool; each worker builds its own PDFGenerator once.
+        
         Args:
             statements: List of statement data dictionaries
+            max_workers: Worker processes to use, defaults to the CPU count;
+                1 renders in this process
             
         Returns:
             Dict[str, Optional[Path]]: Statement IDs mapped to PDF paths
         """
         results = {}
+        statement_ids = [
+            statement_data.get('statement_id', f'unknown_{i}')
+            for i, statement_data in enumerate(statements)
+        ]
+        workers = min(len(statements), max_workers or os.cpu_count() or 1)
         
-        for statement_data in statements:
-            try:
-                statement_id = statement_data.get('statement_id', f'unknown_{len(results)}')
-                pdf_path = self.generate_statement_pdf(statement_data)
-                results[statement_id] = pdf_path
-                
-                if pdf_path:
-                    logger.info(f"Generated PDF for statement {statement_id}")
-                else:
-                    logger.error(f"Failed to generate PDF for statement {statement_id}")
-                    
-            except Exception as e:
-                logger.error(f"Error in batch processing: {str(e)}")
-                results[statement_id] = None
+        try:
+            if workers <= 1:
+                pdf_paths = self._iter_pipelined_pdfs(statements)
+                self._collect_batch_results(results, statement_ids, pdf_paths)
+            else:
+                output_dir = str(self.output_dir)
+                with render_pool(workers) as executor:
+                    pdf_paths = executor.map(
+                        _render_one, [output_dir] * len(statements), statements, chunksize=4
+                    )
+                    self._collect_batch_results(results, statement_ids, pdf_paths)
+        except Exception as e:
+            logger.error(f"Error in batch processing: {str(e)}")
+            for statement_id in statement_ids:
+                results.setdefault(statement_id, None)
         
-        logger.info(f"Batch processing complete: {len([p for p in results.values() if p])} successful, "
-                   f"{len([p for p in results.values() if not p])} failed")
+        # One pass over the final results, which also covers statements the
+        # error path above marked as failed
+        successful = sum(1 for pdf_path in results.values() if pdf_path)
+        logger.info(f"Batch processing complete: {successful} successful, "
+                   f"{len(results) - successful} failed")
         
         return results
+    
+    def _iter_pipelined_pdfs(self, statements: list) -> Iterator[Optional[Path]]:
+        """
+        Generate a single-process batch, statement by statement.
+        
+        A thread renders the HTML of the next statements while this thread
+        lays out and writes the current one, so the Jinja render overlaps
+        the PDF write. The queue holds at most two rendered statements. If
+        the caller stops iterating early, the render thread is stopped and
+        joined when the generator is closed.
+        
+        Args:
+            statements: List of statement data dictionaries
+            
+        Yields:
+            Optional[Path]: PDF path per statement, in order, or None if failed
+        """
+        rendered = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        
+        def render_all():
+            for statement_data in statements:
+                if stop.is_set():
+                    return
+                rendered.put(self._render_statement(statement_data))
+        
+        renderer = threading.Thread(target=render_all, name='pdf-render', daemon=True)
+        renderer.start()
+        
+        try:
+            for _ in statements:
+                result = self._write_statement_pdf(rendered.get())
+                yield result.path if result else None
+        finally:
+            stop.set()
+            # Free the queue so a put blocked on it returns and sees the stop;
+            # at most one more render lands after this, and there is room
+            while True:
+                try:
+                    rendered.get_nowait()
+                except queue.Empty:
+                    break
+            renderer.join()
+    
+    @staticmethod
+    def _collect_batch_results(results: Dict, statement_ids: list, pdf_paths):
+        """Record batch render outcomes, in statement order, into results."""
+        for statement_id, pdf_path in zip(statement_ids, pdf_paths):
+            results[statement_id] = pdf_path
+            
+            if pdf_path:
+                logger.info(f"Generated PDF for statement {statement_id}")
+            else:
+                logger.error(f"Failed to generate PDF for statement {statement_id}")
 
 
 class PDFMetadataInjector:
@@ -1,17 +1,81 @@
 """
 Template management system for financial statement PDF generation.
 """
-import json
 import logging
+import os
+import re
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Optional, List, Any
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound
+import orjson
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, TemplateNotFound
 from config.airflow_config import TEMPLATE_CONFIG, TEMPLATES_DIR
 
+try:
+    # C parser for ISO 8601 timestamps, installed with the "performance" extra
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+except ImportError:
+    def _parse_iso_datetime(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
 logger = logging.getLogger(__name__)
 
 
+# Marks context keys that were absent from the statement before rendering
+_MISSING = object()
+
+
+def _read_config(config_file: Path) -> Dict:
+    """Parse a template config.json, or return {} if there is none."""
+    try:
+        return orjson.loads(config_file.read_bytes())
+    except FileNotFoundError:
+        return {}
+
+
+# strftime formats for the named date filter styles; any other style is
+# used as a format string itself
+_DATE_FORMATS = {
+    'short': '%m/%d/%Y',
+    'long': '%B %d, %Y',
+    'iso': '%Y-%m-%d'
+}
+
+
+def _currency_filter(value: float, currency_code: str = 'USD') -> str:
+    """Format a number as currency."""
+    if currency_code == 'USD':
+        return f"${value:,.2f}"
+    return f"{value:,.2f} {currency_code}"
+
+
+def _date_filter(date_string: str, format_type: str = 'short') -> str:
+    """Format a date string."""
+    try:
+        date_obj = _parse_iso_datetime(date_string)
+        return date_obj.strftime(_DATE_FORMATS.get(format_type, format_type))
+    except ValueError:
+        return date_string
+
+
+def _percentage_filter(value: float, precision: int = 2) -> str:
+    """Format a decimal as percentage."""
+    return f"{value * 100:.{precision}f}%"
+
+
+def _account_number_filter(account_number: str) -> str:
+    """Format account number with masking."""
+    if len(account_number) > 4:
+        return f"****{account_number[-4:]}"
+    return account_number
+
+
+def _version_key(version: str) -> tuple:
+    """Sort key comparing versions by their numeric parts, so 1.10 follows 1.9."""
+    return tuple(int(part) for part in re.findall(r'\d+', version)), version
+
+
 class TemplateVersion:
     """Represents a specific version of a template."""
     
@@ -22,6 +86,13 @@ class TemplateVersion:
         self.config = config
         self.created_date = datetime.fromisoformat(config.get('created_date', datetime.utcnow().isoformat()))
         self.is_active = config.get('is_active', True)
+        # PDF engine for this template: 'weasyprint' for paged CSS layouts,
+        # 'reportlab' for plain tabular statements that don't need them
+        self.engine = config.get('engine', 'weasyprint')
+        # Stylesheet kept beside the template and passed to WeasyPrint
+        # pre-parsed, instead of inlined in the HTML and parsed per render
+        stylesheet = config.get('stylesheet')
+        self.stylesheet_path = template_path.with_name(stylesheet) if stylesheet else None
 
 
 class TemplateManager:
@@ -38,20 +109,30 @@ class TemplateManager:
         """
         self.templates_dir = Path(templates_dir or TEMPLATES_DIR)
         self.config = TEMPLATE_CONFIG
-        self._template_cache = {}
+        # Least recently used templates are evicted past template_cache_size
+        self._template_cache: "OrderedDict[str, Template]" = OrderedDict()
+        self._template_cache_size = self.config.get('template_cache_size', 64)
         self._template_registry = {}
-        self._load_templates()
+        self._template_versions: Dict[str, TemplateVersion] = {}
+        self._latest_active: Dict[str, TemplateVersion] = {}
         
-        # Configure Jinja2 environment
+        # Configure Jinja2 environment. Templates are immutable once deployed,
+        # so skip the per-lookup mtime check and keep compiled templates. The
+        # bytecode cache persists compiled templates across process restarts.
         self.jinja_env = Environment(
             loader=FileSystemLoader(str(self.templates_dir)),
             autoescape=True,
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            auto_reload=False,
+            bytecode_cache=FileSystemBytecodeCache(self.config.get('bytecode_cache_dir'))
         )
         
-        # Add custom filters
+        # Add custom filters; templates using them only compile once registered
         self._register_custom_filters()
+        
+        self._load_templates()
+        self._precompile_templates()
     
     def _load_templates(self):
         """Load all available templates from the templates directory."""
@@ -60,10 +141,21 @@ class TemplateManager:
                 logger.warning(f"Templates directory not found: {self.templates_dir}")
                 return
             
-            # Scan for template directories
-            for template_type_dir in self.templates_dir.iterdir():
-                if template_type_dir.is_dir():
-                    self._load_template_type(template_type_dir.name, template_type_dir)
+            # Scan for template directories; DirEntry answers is_dir() from
+            # the directory listing, only symlinks need a stat
+            with os.scandir(self.templates_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir() and not entry.name.startswith('.'):
+                        self._load_template_type(entry.name, Path(entry.path))
+            
+            # Versions are only registered here, so the latest active version
+            # of each type is fixed once loading finishes
+            for template_type, versions in self._template_registry.items():
+                active_versions = [tv for tv in versions.values() if tv.is_active]
+                if active_versions:
+                    self._latest_active[template_type] = max(
+                        active_versions, key=lambda tv: _version_key(tv.version)
+                    )
                     
             logger.info(f"Loaded {len(self._template_registry)} template types")
             
@@ -82,15 +174,16 @@ class TemplateManager:
             self._template_registry[template_type] = {}
             
             # Look for version directories or files
-            for item in type_dir.iterdir():
-                if item.is_dir():
-                    # Version directory (e.g., v1.0, v1.1)
-                    version = item.name.replace('v', '')
-                    self._load_template_version(template_type, version, item)
-                elif item.suffix == '.html':
-                    # Direct HTML file (default version)
-                    version = self.config['default_version']
-                    self._load_template_file(template_type, version, item)
+            with os.scandir(type_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # Version directory (e.g., v1.0, v1.1)
+                        version = entry.name.replace('v', '')
+                        self._load_template_version(template_type, version, Path(entry.path))
+                    elif entry.name.endswith('.html'):
+                        # Direct HTML file (default version)
+                        version = self.config['default_version']
+                        self._load_template_file(template_type, version, Path(entry.path))
                     
         except Exception as e:
             logger.error(f"Error loading template type {template_type}: {str(e)}")
@@ -101,19 +194,13 @@ class TemplateManager:
             config_file = version_dir / 'config.json'
             template_file = version_dir / 'template.html'
             
-            # Load configuration
-            config = {}
-            if config_file.exists():
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
-            
             # Load template
             if template_file.exists():
                 template_version = TemplateVersion(
                     name=template_type,
                     version=version,
                     template_path=template_file,
-                    config=config
+                    config=_read_config(config_file)
                 )
                 
                 self._template_registry[template_type][version] = template_version
@@ -125,11 +212,14 @@ class TemplateManager:
     def _load_template_file(self, template_type: str, version: str, template_file: Path):
         """Load a template from a direct HTML file."""
         try:
+            config = {'is_active': True, 'created_date': datetime.utcnow().isoformat()}
+            config.update(_read_config(template_file.with_name('config.json')))
+            
             template_version = TemplateVersion(
                 name=template_type,
                 version=version,
                 template_path=template_file,
-                config={'is_active': True, 'created_date': datetime.utcnow().isoformat()}
+                config=config
             )
             
             if template_type not in self._template_registry:
@@ -141,6 +231,12 @@ class TemplateManager:
         except Exception as e:
             logger.error(f"Error loading template file {template_type} v{version}: {str(e)}")
     
+    def _precompile_templates(self):
+        """Compile every registered template version into the template cache."""
+        for template_name, versions in self._template_registry.items():
+            for version in versions:
+                self.get_template(template_name, version)
+    
     def get_template(self, template_name: str, version: Optional[str] = None) -> Optional[Template]:
         """
         Get a specific template by name and version.
@@ -156,8 +252,10 @@ class TemplateManager:
             # Use cache key
             cache_key = f"{template_name}:{version or 'latest'}"
             
-            if cache_key in self._template_cache:
-                return self._template_cache[cache_key]
+            template = self._template_cache.get(cache_key)
+            if template is not None:
+                self._template_cache.move_to_end(cache_key)
+                return template
             
             # Find template version
             template_version = self._find_template_version(template_name, version)
@@ -171,6 +269,9 @@ class TemplateManager:
             
             # Cache the template
             self._template_cache[cache_key] = template
+            if len(self._template_cache) > self._template_cache_size:
+                self._template_cache.popitem(last=False)
+            self._template_versions[template.name] = template_version
             
             logger.debug(f"Retrieved template {template_name} v{template_version.version}")
             return template
@@ -193,26 +294,11 @@ class TemplateManager:
         Returns:
             Optional[TemplateVersion]: Template version or None
         """
-        if template_name not in self._template_registry:
-            return None
-        
-        template_versions = self._template_registry[template_name]
-        
         if version:
-            return template_versions.get(version)
-        
-        # Find latest active version
-        active_versions = [
-            tv for tv in template_versions.values() 
-            if tv.is_active
-        ]
+            return self._template_registry.get(template_name, {}).get(version)
         
-        if not active_versions:
-            return None
-        
-        # Sort by version (assuming semantic versioning)
-        active_versions.sort(key=lambda x: x.version, reverse=True)
-        return active_versions[0]
+        # Latest active version, found when the templates were loaded
+        return self._latest_active.get(template_name)
     
     def get_available_templates(self) -> Dict[str, List[str]]:
         """
@@ -255,47 +341,40 @@ class TemplateManager:
         
         return template
     
-    def _register_custom_filters(self):
-        """Register custom Jinja2 filters for financial data formatting."""
-        
-        def currency_filter(value: float, currency_code: str = 'USD') -> str:
-            """Format a number as currency."""
-            if currency_code == 'USD':
-                return f"${value:,.2f}"
-            return f"{value:,.2f} {currency_code}"
-        
-        def date_filter(date_string: str, format_type: str = 'short') -> str:
-            """Format a date string."""
-            try:
-                date_obj = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
-                
-                if format_type == 'short':
-                    return date_obj.strftime('%m/%d/%Y')
-                elif format_type == 'long':
-                    return date_obj.strftime('%B %d, %Y')
-                elif format_type == 'iso':
-                    return date_obj.strftime('%Y-%m-%d')
-                else:
-                    return date_obj.strftime(format_type)
-                    
-            except ValueError:
-                return date_string
-        
-        def percentage_filter(value: float, precision: int = 2) -> str:
-            """Format a decimal as percentage."""
-            return f"{value * 100:.{precision}f}%"
+    def get_engine(self, template: Template) -> str:
+        """
+        Get the PDF engine configured for a template.
         
-        def account_number_filter(account_number: str) -> str:
-            """Format account number with masking."""
-            if len(account_number) > 4:
-                return f"****{account_number[-4:]}"
-            return account_number
+        Args:
+            template: Template returned by get_template or select_template
+            
+        Returns:
+            str: 'weasyprint' or 'reportlab'
+        """
+        template_version = self._template_versions.get(template.name)
+        return template_version.engine if template_version else 'weasyprint'
+    
+    def get_stylesheet(self, template: Template) -> Optional[Path]:
+        """
+        Get the separate stylesheet configured for a template.
         
-        # Register filters
-        self.jinja_env.filters['currency'] = currency_filter
-        self.jinja_env.filters['date'] = date_filter
-        self.jinja_env.filters['percentage'] = percentage_filter
-        self.jinja_env.filters['account_number'] = account_number_filter
+        Args:
+            template: Template returned by get_template or select_template
+            
+        Returns:
+            Optional[Path]: Stylesheet path, or None if the template inlines its CSS
+        """
+        template_version = self._template_versions.get(template.name)
+        return template_version.stylesheet_path if template_version else None
+    
+    def _register_custom_filters(self):
+        """Register custom Jinja2 filters for financial data formatting."""
+        self.jinja_env.filters.update({
+            'currency': _currency_filter,
+            'date': _date_filter,
+            'percentage': _percentage_filter,
+            'account_number': _account_number_filter
+        })
     
     def render_template(self, template: Template, data: Dict) -> str:
         """
@@ -308,21 +387,35 @@ class TemplateManager:
         Returns:
             str: Rendered HTML content
         """
+        # Helpers are set on the statement dict itself for the render and
+        # restored afterwards, rather than copying the statement into a new
+        # context first
+        helpers = {
+            'now': datetime.utcnow(),
+            'format_currency': _currency_filter
+        }
+        previous = {key: data.get(key, _MISSING) for key in helpers}
+        data.update(helpers)
+        
         try:
-            # Add helper functions to context
-            context = {
-                **data,
-                'now': datetime.utcnow(),
-                'format_currency': lambda x, c='USD': self.jinja_env.filters['currency'](x, c)
-            }
-            
-            return template.render(**context)
+            return template.render(data)
             
         except Exception as e:
             logger.error(f"Error rendering template: {str(e)}")
             raise
+        finally:
+            for key, value in previous.items():
+                if value is _MISSING:
+                    del data[key]
+                else:
+                    data[key] = value
     
     def clear_cache(self):
-        """Clear the template cache."""
+        """
+        Clear the in-memory template cache.
+        
+        The bytecode cache on disk is kept, so reloading a template skips
+        recompiling it.
+        """
         self._template_cache.clear()
         logger.info("Template cache cleared")
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+msgspec mirrors of the financial statement models.
+
+Used by StatementValidator's "msgspec" backend to decode raw Kafka payloads
+and convert parsed messages straight into structs. Requires the optional
+msgspec dependency, installed with the "performance" extra.
+"""
+from typing import Dict, List, Literal, Optional, Union
+from datetime import datetime
+
+import msgspec
+from typing_extensions import Annotated
+
+try:
+    # C parser for ISO 8601 timestamps, installed with the "performance" extra
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+except ImportError:
+    def _parse_iso_datetime(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+NonEmptyStr = Annotated[str, msgspec.Meta(min_length=1)]
+CurrencyCode = Annotated[str, msgspec.Meta(min_length=3, max_length=3)]
+# The JSON schema leaves balances and totals untyped and the pydantic models
+# accept numeric strings there, so these fields take either and convert in
+# __post_init__; everything else decodes strictly, like the schema
+LaxFloat = Union[float, str]
+
+
+class CustomerInfo(msgspec.Struct):
+    """Customer information struct."""
+    customer_id: NonEmptyStr
+    name: NonEmptyStr
+    address: Optional[Dict[str, str]] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+
+
+class Transaction(msgspec.Struct):
+    """Individual transaction struct."""
+    transaction_id: NonEmptyStr
+    date: str
+    description: NonEmptyStr
+    amount: float
+    category: Optional[str] = None
+    reference: Optional[str] = None
+
+    def __post_init__(self):
+        try:
+            _parse_iso_datetime(self.date)
+        except ValueError:
+            raise ValueError('Invalid date format. Use ISO 8601 format.')
+
+
+class Balance(msgspec.Struct):
+    """Account balance struct."""
+    account_type: NonEmptyStr
+    opening_balance: LaxFloat
+    closing_balance: LaxFloat
+    currency: CurrencyCode = 'USD'
+
+    def __post_init__(self):
+        self.opening_balance = float(self.opening_balance)
+        self.closing_balance = float(self.closing_balance)
+
+
+class StatementMetadata(msgspec.Struct):
+    """Statement metadata struct."""
+    template_name: str = 'monthly'
+    template_version: str = '1.0'
+    currency: CurrencyCode = 'USD'
+    processing_timestamp: Optional[str] = None
+
+
+class FinancialStatement(msgspec.Struct, kw_only=True):
+    """Complete financial statement struct."""
+    statement_id: NonEmptyStr
+    customer_id: NonEmptyStr
+    statement_date: str
+    # Literal keeps the JSON schema's enum, so the decoder rejects other types
+    statement_type: Literal['monthly', 'quarterly', 'annual'] = 'monthly'
+    customer_info: CustomerInfo
+    transactions: List[Transaction] = msgspec.field(default_factory=list)
+    balances: Dict[str, Balance] = msgspec.field(default_factory=dict)
+    totals: Dict[str, LaxFloat] = msgspec.field(default_factory=dict)
+    metadata: StatementMetadata = msgspec.field(default_factory=StatementMetadata)
+
+    def __post_init__(self):
+        try:
+            _parse_iso_datetime(self.statement_date)
+        except ValueError:
+            raise ValueError('Invalid statement_date format. Use ISO 8601 format.')
+        if self.totals:
+            self.totals = {key: float(value) for key, value in self.totals.items()}
+
+
+# Decoders are reusable and keep their compiled type info, so build one
+_STATEMENT_DECODER = msgspec.json.Decoder(FinancialStatement)
+
+
+def decode_statement(payload) -> FinancialStatement:
+    """
+    Decode and validate a JSON statement payload.
+
+    Args:
+        payload: JSON-encoded statement message
+
+    Returns:
+        FinancialStatement: Decoded statement
+
+    Raises:
+        msgspec.ValidationError: If the payload does not match the models
+    """
+    return _STATEMENT_DECODER.decode(payload)
+
+
+def convert_statement(message: Dict) -> FinancialStatement:
+    """
+    Validate a parsed statement message and convert it into the structs.
+    
+    Args:
+        message: Parsed statement message
+        
+    Returns:
+        FinancialStatement: Converted statement
+        
+    Raises:
+        msgspec.ValidationError: If the message does not match the models
+    """
+    return msgspec.convert(message, FinancialStatement)
+
+
+def statement_to_dict(statement: FinancialStatement) -> Dict:
+    """Convert a decoded statement to plain dicts and lists."""
+    return msgspec.to_builtins(statement)
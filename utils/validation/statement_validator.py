@@ -2,12 +2,30 @@
 Data validation utilities for financial statement processing.
 """
 import logging
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Any, Sequence, Tuple, Union
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
-from pydantic import BaseModel, Field, validator
-from jsonschema import validate, ValidationError
-import json
+import orjson
+from pydantic import BaseModel, Field, TypeAdapter, validator
+from jsonschema import ValidationError
+from jsonschema.validators import validator_for
+
+try:
+    # C parser for ISO 8601 timestamps, installed with the "performance" extra
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+except ImportError:
+    def _parse_iso_datetime(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+try:
+    # Compiles the JSON schema into a specialized Python function, installed
+    # with the "performance" extra
+    import fastjsonschema
+    _SCHEMA_ERRORS = (ValidationError, fastjsonschema.JsonSchemaException)
+except ImportError:
+    fastjsonschema = None
+    _SCHEMA_ERRORS = (ValidationError,)
 
 logger = logging.getLogger(__name__)
 
@@ -26,14 +44,16 @@ class Transaction(BaseModel):
     transaction_id: str = Field(..., min_length=1)
     date: str = Field(...)
     description: str = Field(..., min_length=1)
-    amount: float = Field(...)
+    # Strict, like the JSON schema's "number": raw payloads skip the schema
+    # pass, and lax mode would accept numeric strings there
+    amount: float = Field(..., strict=True)
     category: Optional[str] = None
     reference: Optional[str] = None
     
     @validator('date')
     def validate_date(cls, v):
         try:
-            datetime.fromisoformat(v.replace('Z', '+00:00'))
+            _parse_iso_datetime(v)
             return v
         except ValueError:
             raise ValueError('Invalid date format. Use ISO 8601 format.')
@@ -70,20 +90,123 @@ class FinancialStatement(BaseModel):
     @validator('statement_date')
     def validate_statement_date(cls, v):
         try:
-            datetime.fromisoformat(v.replace('Z', '+00:00'))
+            _parse_iso_datetime(v)
             return v
         except ValueError:
             raise ValueError('Invalid statement_date format. Use ISO 8601 format.')
 
 
+@lru_cache(maxsize=None)
+def _compile_schema(schema_json: bytes) -> Tuple[Any, Optional[Callable[[Dict], Any]]]:
+    """
+    Build the checks for a JSON schema, once per process.
+    
+    The jsonschema validator is checked against its metaschema and built
+    once, instead of on every jsonschema.validate() call. Its class is the
+    one validate() picks for the schema; formats stay unchecked, as there.
+    
+    Args:
+        schema_json: The schema serialized with sorted keys, so equal
+            schemas share one entry
+        
+    Returns:
+        Tuple: The jsonschema validator, and the fastjsonschema check
+            function or None when fastjsonschema is not installed
+    """
+    schema = orjson.loads(schema_json)
+    validator_cls = validator_for(schema)
+    validator_cls.check_schema(schema)
+    
+    compiled_check = None
+    if fastjsonschema is not None:
+        compiled_check = fastjsonschema.compile(schema, use_default=False, use_formats=False)
+    
+    return validator_cls(schema), compiled_check
+
+
+# Built once at import; validates a parsed message dict without the kwargs
+# unpacking (a full copy of the top-level dict) that FinancialStatement(**message) does
+_STATEMENT_ADAPTER = TypeAdapter(FinancialStatement)
+
+# The JSON schema leaves balance entries untyped, so the trusted path still
+# validates them; the amounts feed normalization and the PDF tables
+_BALANCES_ADAPTER = TypeAdapter(Dict[str, Balance])
+
+def _construct_statement(message: Dict) -> FinancialStatement:
+    """
+    Build a FinancialStatement from a schema-checked message without validation.
+    
+    Nested models are constructed too, so the result has the same shape as
+    a validated statement; missing fields get the model defaults. Balances
+    are the exception: the schema does not type them, so they are validated.
+    """
+    fields = dict(message)
+    fields['customer_info'] = CustomerInfo.model_construct(**message['customer_info'])
+    if 'transactions' in message:
+        fields['transactions'] = [Transaction.model_construct(**t) for t in message['transactions']]
+    if 'balances' in message:
+        fields['balances'] = _BALANCES_ADAPTER.validate_python(message['balances'])
+    if 'metadata' in message:
+        fields['metadata'] = StatementMetadata.model_construct(**message['metadata'])
+    return FinancialStatement.model_construct(**fields)
+
+
+# The one JSON schema constraint the models do not encode themselves
+_STATEMENT_TYPES = frozenset(('monthly', 'quarterly', 'annual'))
+
+# Template names the business rules accept without a warning
+_SUPPORTED_TEMPLATES = frozenset(('monthly', 'quarterly', 'annual'))
+
+# Transactions above this absolute amount are logged as unusually large
+_LARGE_AMOUNT = 1_000_000  # $1M limit
+
+# Top-level fields the JSON schema requires, for the batch precheck
+_REQUIRED_FIELDS = frozenset(('statement_id', 'customer_id', 'statement_date', 'customer_info'))
+
+
 class StatementValidator:
     """
     Comprehensive validator for financial statement data.
     """
     
-    def __init__(self):
-        """Initialize the validator with schema definitions."""
+    def __init__(self, backend: str = 'pydantic', trust_schema: bool = False):
+        """
+        Initialize the validator with schema definitions.
+        
+        Args:
+            backend: Statement models to validate into, 'pydantic' or
+                'msgspec' (needs the "performance" extra)
+            trust_schema: Build models from parsed messages that pass the JSON
+                schema without validating them again, except for the
+                balances. The schema does not check date formats, so only
+                enable this for trusted producers. Ignored by the msgspec
+                backend.
+        """
         self.schema = self._load_json_schema()
+        self.backend = backend
+        self._build_statement = (
+            _construct_statement if trust_schema else _STATEMENT_ADAPTER.validate_python
+        )
+        
+        # Shared by every validator in the process with the same schema
+        self._schema_validator, compiled_check = _compile_schema(
+            orjson.dumps(self.schema, option=orjson.OPT_SORT_KEYS)
+        )
+        self._check_schema = compiled_check or self._check_schema_jsonschema
+        
+        if backend == 'pydantic':
+            self._decode_raw = self._decode_raw_pydantic
+            # model_dump directly: the deprecated dict() alias warns on every call
+            self._to_dict = FinancialStatement.model_dump
+        elif backend == 'msgspec':
+            from .msgspec_models import convert_statement, decode_statement, statement_to_dict
+            self._decode_raw = decode_statement
+            self._to_dict = statement_to_dict
+            # Parsed messages still get the schema check, then convert into
+            # the structs without a second model validation pass
+            self._build_statement = convert_statement
+        else:
+            raise ValueError(f"Unsupported validation backend: {backend}")
         
     def _load_json_schema(self) -> Dict:
         """Load JSON schema for statement validation."""
@@ -135,42 +258,133 @@ class StatementValidator:
             }
         }
     
-    def validate_statement_message(self, message: Dict) -> Optional[Dict]:
+    def validate_statement_message(self, message: Union[Dict, bytes, str]) -> Optional[Dict]:
         """
         Validate a complete statement message.
         
         Args:
-            message: Raw statement message from Kafka
+            message: Raw statement message from Kafka, parsed or as JSON bytes
             
         Returns:
             Optional[Dict]: Validated message or None if invalid
         """
+        # Raw payloads go straight into the model, without a dict in between
+        if isinstance(message, (bytes, bytearray, memoryview, str)):
+            statement = self.validate_raw(message)
+            return self._to_dict(statement) if statement else None
+        
         try:
             # First, validate against JSON schema
-            validate(instance=message, schema=self.schema)
+            self._check_schema(message)
             
-            # Then validate using Pydantic model for detailed validation
-            statement = FinancialStatement(**message)
+            # Then validate using the backend's models for detailed validation
+            statement = self._build_statement(message)
             
-            # Additional custom validations
-            if not self._validate_amounts(statement):
-                logger.error("Amount validation failed")
-                return None
-                
-            if not self._validate_business_rules(statement):
-                logger.error("Business rule validation failed")
+            if not self._check_statement(statement):
                 return None
             
-            logger.debug(f"Successfully validated statement {statement.statement_id}")
-            return statement.dict()
+            return self._to_dict(statement)
             
-        except ValidationError as e:
-            logger.error(f"JSON schema validation error: {str(e)}")
+        except _SCHEMA_ERRORS as e:
+            logger.error("JSON schema validation error: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Statement validation error: {str(e)}")
+            logger.error("Statement validation error: %s", e)
+            return None
+    
+    def _check_schema_jsonschema(self, message: Dict):
+        """Raise the first JSON schema error in message, if any."""
+        error = next(self._schema_validator.iter_errors(message), None)
+        if error is not None:
+            raise error
+    
+    def validate_many(self, messages: Sequence[Union[Dict, bytes, str]]) -> List[Optional[Dict]]:
+        """
+        Validate a batch of statement messages.
+        
+        Same result as calling validate_statement_message on each message,
+        with the method lookups hoisted out of the loop. Parsed messages
+        missing a required field are rejected before the JSON schema pass.
+        
+        Args:
+            messages: Raw statement messages, parsed or as JSON bytes
+            
+        Returns:
+            List[Optional[Dict]]: Validated message or None for each input
+        """
+        validate_message = self.validate_statement_message
+        required_fields = _REQUIRED_FIELDS
+        results = []
+        append = results.append
+        
+        for message in messages:
+            if isinstance(message, dict) and not message.keys() >= required_fields:
+                missing = sorted(required_fields - message.keys())
+                logger.error("JSON schema validation error: missing required fields %s", missing)
+                append(None)
+            else:
+                append(validate_message(message))
+        
+        return results
+    
+    def validate_raw(self, payload: Union[bytes, str]) -> Optional[FinancialStatement]:
+        """
+        Validate a raw JSON statement payload.
+        
+        The backend decodes the JSON directly into its statement model, so
+        with the msgspec backend the result is the msgspec struct mirror.
+        Values are coerced as in the parsed-message path, and the statement
+        type check stands in for the JSON schema pass, which would need the
+        parsed dict.
+        
+        Args:
+            payload: JSON-encoded statement message
+            
+        Returns:
+            Optional[FinancialStatement]: Validated statement or None if invalid
+        """
+        try:
+            statement = self._decode_raw(payload)
+            
+            if statement.statement_type not in _STATEMENT_TYPES:
+                logger.error("Unsupported statement type: %s", statement.statement_type)
+                return None
+            
+            if not self._check_statement(statement):
+                return None
+            
+            return statement
+            
+        except Exception as e:
+            logger.error("Statement validation error: %s", e)
             return None
     
+    @staticmethod
+    def _decode_raw_pydantic(payload: Union[bytes, str]) -> FinancialStatement:
+        """Parse a raw payload into the pydantic model with pydantic-core."""
+        return _STATEMENT_ADAPTER.validate_json(payload)
+    
+    def _check_statement(self, statement: FinancialStatement) -> bool:
+        """
+        Run the custom validations on a model-validated statement.
+        
+        Args:
+            statement: Validated statement object
+            
+        Returns:
+            bool: True if all checks pass
+        """
+        if not self._validate_amounts(statement):
+            logger.error("Amount validation failed")
+            return False
+            
+        if not self._validate_business_rules(statement):
+            logger.error("Business rule validation failed")
+            return False
+        
+        logger.debug("Successfully validated statement %s", statement.statement_id)
+        return True
+    
     def _validate_amounts(self, statement: FinancialStatement) -> bool:
         """
         Validate monetary amounts are properly formatted.
@@ -182,27 +396,29 @@ class StatementValidator:
             bool: True if amounts are valid
         """
         try:
-            # Validate transaction amounts
-            for transaction in statement.transactions:
-                if not isinstance(transaction.amount, (int, float)):
+            # Validate transaction amounts in one pass: abs() rejects
+            # non-numeric amounts, and the per-transaction walk only runs
+            # when some amount is over the limit
+            amounts = [transaction.amount for transaction in statement.transactions]
+            if amounts:
+                try:
+                    largest = max(map(abs, amounts))
+                except TypeError:
                     return False
-                    
+                
                 # Check for reasonable amount ranges (optional business rule)
-                if abs(transaction.amount) > 1_000_000:  # $1M limit
-                    logger.warning(f"Large transaction amount: {transaction.amount}")
-            
-            # Validate balance amounts
-            for balance_data in statement.balances.values():
-                if isinstance(balance_data, dict):
-                    for key in ['opening_balance', 'closing_balance']:
-                        if key in balance_data:
-                            if not isinstance(balance_data[key], (int, float)):
-                                return False
+                if largest > _LARGE_AMOUNT:
+                    for amount in amounts:
+                        if abs(amount) > _LARGE_AMOUNT:
+                            logger.warning("Large transaction amount: %s", amount)
             
+            # Balances are always Balance models here, never dicts, and are
+            # validated on every path (trust_schema included), so their
+            # amounts are already floats
             return True
             
         except Exception as e:
-            logger.error(f"Amount validation error: {str(e)}")
+            logger.error("Amount validation error: %s", e)
             return False
     
     def _validate_business_rules(self, statement: FinancialStatement) -> bool:
@@ -217,9 +433,7 @@ class StatementValidator:
         """
         try:
             # Rule 1: Statement date should not be in the future
-            statement_date = datetime.fromisoformat(
-                statement.statement_date.replace('Z', '+00:00')
-            )
+            statement_date = _parse_iso_datetime(statement.statement_date)
             if statement_date > datetime.now(statement_date.tzinfo):
                 logger.error("Statement date cannot be in the future")
                 return False
@@ -230,17 +444,43 @@ class StatementValidator:
                 return False
             
             # Rule 3: Template name should be supported
-            supported_templates = ['monthly', 'quarterly', 'annual']
-            if statement.metadata.template_name not in supported_templates:
-                logger.warning(f"Unsupported template: {statement.metadata.template_name}")
+            if statement.metadata.template_name not in _SUPPORTED_TEMPLATES:
+                logger.warning("Unsupported template: %s", statement.metadata.template_name)
             
             return True
             
         except Exception as e:
-            logger.error(f"Business rule validation error: {str(e)}")
+            logger.error("Business rule validation error: %s", e)
             return False
 
 
+# Balance fields rounded by amount normalization
+_BALANCE_AMOUNT_KEYS = ('opening_balance', 'closing_balance')
+
+
+def _normalize_statement_amounts(data: Dict, precision: int) -> Dict:
+    """Round one statement's transaction, balance and total amounts in place."""
+    transactions = data.get('transactions')
+    if transactions:
+        for transaction in transactions:
+            if 'amount' in transaction:
+                transaction['amount'] = round(float(transaction['amount']), precision)
+    
+    for balance_data in (data.get('balances') or {}).values():
+        if isinstance(balance_data, dict):
+            for amount_key in _BALANCE_AMOUNT_KEYS:
+                if amount_key in balance_data:
+                    balance_data[amount_key] = round(float(balance_data[amount_key]), precision)
+    
+    totals = data.get('totals')
+    if totals:
+        for total_key, total_value in totals.items():
+            if isinstance(total_value, (int, float)):
+                totals[total_key] = round(float(total_value), precision)
+    
+    return data
+
+
 class DataTransformer:
     """
     Transform and normalize financial statement data.
@@ -259,57 +499,65 @@ class DataTransformer:
             Dict: Data with normalized amounts
         """
         try:
-            # Normalize transaction amounts
-            if 'transactions' in data:
-                for transaction in data['transactions']:
-                    if 'amount' in transaction:
-                        transaction['amount'] = round(float(transaction['amount']), precision)
-            
-            # Normalize balances
-            if 'balances' in data:
-                for balance_key, balance_data in data['balances'].items():
-                    if isinstance(balance_data, dict):
-                        for amount_key in ['opening_balance', 'closing_balance']:
-                            if amount_key in balance_data:
-                                balance_data[amount_key] = round(
-                                    float(balance_data[amount_key]), precision
-                                )
-            
-            # Normalize totals
-            if 'totals' in data:
-                for total_key, total_value in data['totals'].items():
-                    if isinstance(total_value, (int, float)):
-                        data['totals'][total_key] = round(float(total_value), precision)
-            
-            return data
+            return _normalize_statement_amounts(data, precision)
             
         except Exception as e:
-            logger.error(f"Amount normalization error: {str(e)}")
+            logger.error("Amount normalization error: %s", e)
             raise
     
     @staticmethod
-    def enrich_statement_data(data: Dict) -> Dict:
+    def normalize_amounts_batch(statements: Sequence[Dict], precision: int = 2) -> List[Dict]:
+        """
+        Normalize monetary amounts for a batch of statements.
+        
+        Each statement is normalized as by normalize_amounts. A statement
+        that fails is logged and left out of the result, so one bad
+        statement does not fail the rest of the batch.
+        
+        Args:
+            statements: Statement data dicts (modified in place)
+            precision: Decimal places for amounts
+            
+        Returns:
+            List[Dict]: The statements that were normalized
+        """
+        normalized = []
+        
+        for data in statements:
+            try:
+                normalized.append(_normalize_statement_amounts(data, precision))
+            except Exception as e:
+                logger.error("Amount normalization error, skipping statement %s: %s",
+                             data.get('statement_id'), e)
+        
+        return normalized
+    
+    @staticmethod
+    def enrich_statement_data(data: Dict, processed_timestamp: Optional[str] = None) -> Dict:
         """
         Enrich statement data with calculated fields.
         
         Args:
             data: Statement data
+            processed_timestamp: Processing time to record, defaults to now (UTC)
             
         Returns:
             Dict: Enriched statement data
         """
         try:
             # Calculate transaction summary
-            if 'transactions' in data and data['transactions']:
-                total_credits = sum(
-                    t['amount'] for t in data['transactions'] 
-                    if t['amount'] > 0
-                )
-                total_debits = sum(
-                    abs(t['amount']) for t in data['transactions'] 
-                    if t['amount'] < 0
-                )
-                transaction_count = len(data['transactions'])
+            transactions = data.get('transactions')
+            if transactions:
+                # Credits and debits in a single pass over the transactions
+                total_credits = 0
+                total_debits = 0
+                for transaction in transactions:
+                    amount = transaction['amount']
+                    if amount > 0:
+                        total_credits += amount
+                    elif amount < 0:
+                        total_debits -= amount
+                transaction_count = len(transactions)
                 
                 # Add summary to totals
                 if 'totals' not in data:
@@ -326,11 +574,38 @@ class DataTransformer:
             if 'metadata' not in data:
                 data['metadata'] = {}
                 
-            data['metadata']['processed_timestamp'] = datetime.utcnow().isoformat()
+            data['metadata']['processed_timestamp'] = processed_timestamp or datetime.utcnow().isoformat()
             data['metadata']['processor_version'] = '1.0.0'
             
             return data
             
         except Exception as e:
-            logger.error(f"Data enrichment error: {str(e)}")
-            raise
\ No newline at end of file
+            logger.error("Data enrichment error: %s", e)
+            raise
+    
+    @staticmethod
+    def enrich_statements_batch(statements: Sequence[Dict]) -> List[Dict]:
+        """
+        Enrich a batch of statements processed together.
+        
+        The whole batch shares one processed_timestamp, taken once up front.
+        A statement that fails enrichment is left out of the result, so one
+        bad statement does not fail the rest of the batch.
+        
+        Args:
+            statements: Statement data dicts (modified in place)
+            
+        Returns:
+            List[Dict]: The statements that were enriched
+        """
+        processed_timestamp = datetime.utcnow().isoformat()
+        enriched = []
+        
+        for data in statements:
+            try:
+                enriched.append(DataTransformer.enrich_statement_data(data, processed_timestamp))
+            except Exception:
+                # enrich_statement_data has logged the error
+                logger.warning("Skipping statement %s after enrichment error", data.get('statement_id'))
+        
+        return enriched